@@ -0,0 +1,112 @@
+"""
+Admission control for the inference endpoints.
+At most max_in_flight requests run at once and at most max_queue more wait
+for a slot; anything beyond that is turned away immediately so latency for
+admitted requests stays bounded instead of every request slowing down.
+"""
+import collections
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; reason is "queue_full" or "timeout" """
+    def __init__(self, reason, retry_after):
+        super().__init__(f"server overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """A queued request; release() grants it a slot directly"""
+    __slots__ = ("cond", "granted")
+
+    def __init__(self, lock):
+        self.cond = threading.Condition(lock)
+        self.granted = False
+
+
+class AdmissionController:
+    """Bounded in-flight slots plus a bounded FIFO wait queue.
+
+    A release() with requests queued hands its slot straight to the oldest
+    one and wakes only that request, so a slot is never left free while
+    someone waits, whoever gets the lock first and whatever their deadlines.
+    """
+    def __init__(self, max_in_flight, max_queue=0, timeout=None, retry_after=1):
+        """
+        max_in_flight: concurrent admitted requests; 0 disables admission control.
+        max_queue: requests allowed to wait for a slot before new ones are rejected.
+        timeout: seconds a queued request waits before giving up (None waits forever).
+        retry_after: seconds suggested to rejected clients.
+        """
+        self.max_in_flight = max(0, int(max_in_flight))
+        self.max_queue = max(0, int(max_queue))
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._queue = collections.deque()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+
+    @property
+    def enabled(self):
+        return self.max_in_flight > 0
+
+    @property
+    def waiting(self):
+        return len(self._queue)
+
+    def _reject(self, reason):
+        self.rejected[reason] += 1
+        raise Overloaded(reason, self.retry_after)
+
+    def acquire(self):
+        """Take a slot, waiting in the queue if there is room; raises Overloaded otherwise"""
+        if not self.enabled:
+            return
+        with self._lock:
+            # queued requests go first, so a newcomer only takes a free slot if nobody waits
+            if self.in_flight < self.max_in_flight and not self._queue:
+                self.in_flight += 1
+            else:
+                if len(self._queue) >= self.max_queue:
+                    self._reject("queue_full")
+                ticket = _Ticket(self._lock)
+                self._queue.append(ticket)
+                deadline = None if self.timeout is None else time.monotonic() + self.timeout
+                while not ticket.granted:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._queue.remove(ticket)
+                        self._reject("timeout")
+                    ticket.cond.wait(remaining)
+                # release() handed its slot over, in_flight already counts it
+            self.admitted += 1
+
+    def release(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._queue:
+                ticket = self._queue.popleft()
+                ticket.granted = True
+                ticket.cond.notify()
+            else:
+                self.in_flight -= 1
+
+    @contextmanager
+    def admit(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._lock:
+            return {"enabled": self.enabled, "in_flight": self.in_flight, "waiting": self.waiting,
+                    "max_in_flight": self.max_in_flight, "max_queue": self.max_queue,
+                    "admitted": self.admitted, "rejected": dict(self.rejected)}
@@ -1,63 +1,346 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+import time
+_IMPORT_START = time.perf_counter()  # first statement, so the report includes torch/flask imports
+
+from flask import Flask, Request, request, jsonify, render_template
 from flask_cors import CORS
 import torch
-import torch.nn as nn
-from torchvision import models
 import os
+import io
 import tempfile
-import uuid
 import threading
-import subprocess
-from PIL import Image
-import numpy as np
-import sys
+from functools import wraps
+from stroke_models import (CLASS_MAP, load_classifier, decode_image, preprocess_image,
+                           preprocess_batch, run_cascade, SpeculativeCascade, checkpoint_version, optimize_for_inference, warmup)
+from batching import MicroBatcher
+from quantize_models import load_quantized_classifier
+from prediction_cache import PredictionCache, SingleFlight, content_key
+from server_metrics import MetricsRegistry
+from admission import AdmissionController, Overloaded
+from game_supervisor import GameSupervisor, game_command
+from volume_inference import VOLUME_EXTS, iter_slices, predict_volume
+
+# Request bodies over PREDICT_MAX_UPLOAD_MB are rejected with 413 from the
+# Content-Length header (or once a chunked body passes the limit), before
+# they are buffered. 0 disables the limit.
+PREDICT_MAX_UPLOAD_MB = float(os.environ.get("PREDICT_MAX_UPLOAD_MB", 32))
+# /api/predict/volume uploads have their own limit and are written to a temp
+# file (in VOLUME_TMP_DIR, default the system temp dir) that slices are
+# memory-mapped or decoded from, so a CT stack never sits in RAM.
+PREDICT_MAX_VOLUME_MB = float(os.environ.get("PREDICT_MAX_VOLUME_MB", 1024))
+VOLUME_TMP_DIR = os.environ.get("VOLUME_TMP_DIR") or None
+VOLUME_ROUTE = "/api/predict/volume"
+
+
+class InMemoryRequest(Request):
+    """Keep uploaded images in memory instead of spooling large ones to a temp file;
+    volume uploads always go to a temp file"""
+    @property
+    def max_content_length(self):
+        if self.path == VOLUME_ROUTE:
+            return int(PREDICT_MAX_VOLUME_MB * 2 ** 20) or None
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.path == VOLUME_ROUTE:
+            return tempfile.TemporaryFile("wb+", dir=VOLUME_TMP_DIR)
+        return io.BytesIO()
+
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
+app.request_class = InMemoryRequest
+app.config["MAX_CONTENT_LENGTH"] = int(PREDICT_MAX_UPLOAD_MB * 2 ** 20) or None
 CORS(app)
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-# ============ LOAD MODELS ============
-stage1_model = models.resnet50(pretrained=False)
-stage1_model.conv1 = nn.Conv2d(1, 64, kernel_size=7, stride=2, padding=3, bias=False)
-stage1_model.fc = nn.Linear(stage1_model.fc.in_features, 2)
-stage1_model.load_state_dict(torch.load("best_stage1_model.pth", map_location=device))
-stage1_model.to(device).eval()
+# ============ MODEL CONFIG ============
+STAGE1_CHECKPOINT = os.environ.get("STAGE1_CHECKPOINT", "best_stage1_model.pth")
+STAGE2_CHECKPOINT = os.environ.get("STAGE2_CHECKPOINT", "best_stage2_model.pth")
+
+# PREDICT_QUANTIZED=1 serves the INT8 TorchScript models written by
+# quantize_models.py instead of the FP32 checkpoints (CPU only).
+PREDICT_QUANTIZED = os.environ.get("PREDICT_QUANTIZED", "0") == "1"
+STAGE1_INT8_CHECKPOINT = os.environ.get("STAGE1_INT8_CHECKPOINT", "best_stage1_model_int8.pt")
+STAGE2_INT8_CHECKPOINT = os.environ.get("STAGE2_INT8_CHECKPOINT", "best_stage2_model_int8.pt")
+
+# PREDICT_BACKEND=onnx runs both stages on ONNX Runtime sessions exported by
+# onnx_backend.py; "torch" (default) uses the PyTorch models above.
+PREDICT_BACKEND = os.environ.get("PREDICT_BACKEND", "torch").strip().lower()
+STAGE1_ONNX = os.environ.get("STAGE1_ONNX", "best_stage1_model.onnx")
+STAGE2_ONNX = os.environ.get("STAGE2_ONNX", "best_stage2_model.onnx")
+
+if PREDICT_QUANTIZED or PREDICT_BACKEND == "onnx":
+    device = torch.device("cpu")
+
+# Concurrent /api/predict requests are grouped for up to PREDICT_MAX_WAIT_MS
+# and run through the cascade as one batch (PREDICT_MAX_BATCH=1 disables).
+PREDICT_MAX_BATCH = int(os.environ.get("PREDICT_MAX_BATCH", 8))
+PREDICT_MAX_WAIT_MS = float(os.environ.get("PREDICT_MAX_WAIT_MS", 5))
+# /api/predict/batch and /api/predict/volume run stage 1 over at most this
+# many images (or slices) at a time
+PREDICT_BATCH_CHUNK = int(os.environ.get("PREDICT_BATCH_CHUNK", 32))
+
+# PREDICT_OPTIMIZE=trace serves frozen TorchScript traces, =compile uses
+# torch.compile; both run channels_last. Empty keeps the eager models.
+PREDICT_OPTIMIZE = os.environ.get("PREDICT_OPTIMIZE", "").strip().lower()
+
+# PREDICT_LATENCY_MODE=speculative runs stage 2 alongside stage 1 instead of
+# after it, each on PREDICT_STAGE_THREADS intra-op threads (default: half the
+# cores). Worth it when cores are idle; "sequential" is cheaper under load.
+PREDICT_LATENCY_MODE = os.environ.get("PREDICT_LATENCY_MODE", "sequential").strip().lower()
+PREDICT_STAGE_THREADS = int(os.environ.get("PREDICT_STAGE_THREADS", 0)) or None
+
+WARMUP_BATCH_SIZES = sorted({1, PREDICT_MAX_BATCH})
+
+# At most PREDICT_MAX_IN_FLIGHT prediction requests run at once and
+# PREDICT_MAX_QUEUE more wait (up to PREDICT_QUEUE_TIMEOUT seconds) for a
+# slot; the rest get 503 with Retry-After: PREDICT_RETRY_AFTER.
+# PREDICT_MAX_IN_FLIGHT=0 disables admission control.
+PREDICT_MAX_IN_FLIGHT = int(os.environ.get("PREDICT_MAX_IN_FLIGHT", 2 * PREDICT_MAX_BATCH))
+PREDICT_MAX_QUEUE = int(os.environ.get("PREDICT_MAX_QUEUE", 4 * PREDICT_MAX_BATCH))
+PREDICT_QUEUE_TIMEOUT = float(os.environ.get("PREDICT_QUEUE_TIMEOUT", 10)) or None
+PREDICT_RETRY_AFTER = int(os.environ.get("PREDICT_RETRY_AFTER", 1))
+
+# PREDICT_LAZY_LOAD=1 defers loading to the first prediction even when the
+# server is started directly; importing the module never loads the models.
+PREDICT_LAZY_LOAD = os.environ.get("PREDICT_LAZY_LOAD", "0") == "1"
+
+# ============ METRICS ============
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram(
+    "predict_stage_seconds",
+    "Time per prediction stage: upload, decode, preprocess, stage1/stage2 (per forward) and total",
+    labelnames=("stage",))
+PREDICTIONS = metrics.counter("predictions_total", "Predictions returned, by class", labelnames=("label",))
+CASCADE_ROWS = metrics.counter("cascade_rows_total", "Images run through stage 1")
+STAGE2_ROUTED = metrics.counter("cascade_stage2_routed_total", "Images stage 1 passed on to stage 2")
+ERRORS = metrics.counter("predict_errors_total", "Failed prediction requests", labelnames=("endpoint",))
+UPLOADS_REJECTED = metrics.counter("upload_rejected_total", "Request bodies rejected for exceeding the upload limit")
+BATCH_SIZE = metrics.histogram("batcher_batch_size", "Images per micro-batch",
+                               buckets=(1, 2, 4, 8, 16, 32, 64))
+metrics.gauge("cascade_stage2_routing_ratio", "Fraction of images that needed stage 2",
+              fn=lambda: (STAGE2_ROUTED.value() / CASCADE_ROWS.value()) if CASCADE_ROWS.value() else 0.0)
+
+
+class _TimedStage:
+    """Records each forward of a cascade stage in STAGE_SECONDS"""
+    def __init__(self, model, stage):
+        self.model = model
+        self.stage = stage
+
+    def __call__(self, x):
+        with STAGE_SECONDS.time(stage=self.stage):
+            return self.model(x)
+
+
+# ============ MODEL LIFECYCLE ============
+class LoadedModels:
+    """Both cascade stages plus everything derived from them"""
+    def __init__(self, stage1, stage2, version, speculative=None):
+        self.stage1 = stage1
+        self.stage2 = stage2
+        self.version = version
+        self.speculative = speculative
+
+
+_models = None
+_models_lock = threading.Lock()
+startup_report = {"import_s": None, "phases": {}, "load_s": None, "loaded": False}
+
+
+def _timed(name, fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    startup_report["phases"][name] = round(time.perf_counter() - t0, 4)
+    return result
+
+
+def warmup_models(run_forwards=True):
+    """Load, optimize and warm up both stages if that hasn't happened yet.
+    Safe to call from several threads; only the first caller does the work.
+    run_forwards=False skips the warmup forwards (e.g. in a pre-fork parent)."""
+    global _models
+    if _models is not None:
+        return _models
+    with _models_lock:
+        if _models is not None:
+            return _models
+        t0 = time.perf_counter()
+        if PREDICT_BACKEND == "onnx":
+            from onnx_backend import OnnxClassifier
+            # sessions are created on first use in each (forked) process, with that
+            # process's torch threads, halved when both stages run at once
+            share = 2 if PREDICT_LATENCY_MODE == "speculative" else 1
+            stage_threads = PREDICT_STAGE_THREADS if share == 2 else None
+            stage1 = _timed("load_stage1", OnnxClassifier, STAGE1_ONNX, threads=stage_threads, share=share)
+            stage2 = _timed("load_stage2", OnnxClassifier, STAGE2_ONNX, threads=stage_threads, share=share)
+            weight_files = [STAGE1_ONNX, STAGE2_ONNX]
+        elif PREDICT_BACKEND != "torch":
+            raise ValueError(f"unknown PREDICT_BACKEND: {PREDICT_BACKEND}")
+        elif PREDICT_QUANTIZED:
+            stage1 = _timed("load_stage1", load_quantized_classifier, STAGE1_INT8_CHECKPOINT)
+            stage2 = _timed("load_stage2", load_quantized_classifier, STAGE2_INT8_CHECKPOINT)
+            weight_files = [STAGE1_INT8_CHECKPOINT, STAGE2_INT8_CHECKPOINT]
+        else:
+            # checkpoints are memory-mapped so forked workers share the weight pages
+            stage1 = _timed("load_stage1", load_classifier, STAGE1_CHECKPOINT, device)
+            stage2 = _timed("load_stage2", load_classifier, STAGE2_CHECKPOINT, device)
+            weight_files = [STAGE1_CHECKPOINT, STAGE2_CHECKPOINT]
+
+        version = os.environ.get("MODEL_VERSION") or _timed("model_version", checkpoint_version, weight_files)
+
+        if PREDICT_OPTIMIZE and PREDICT_BACKEND == "torch" and not PREDICT_QUANTIZED:
+            # the INT8 models are already frozen TorchScript
+            stage1 = _timed("optimize_stage1", optimize_for_inference, stage1, PREDICT_OPTIMIZE)
+            stage2 = _timed("optimize_stage2", optimize_for_inference, stage2, PREDICT_OPTIMIZE)
+
+        if run_forwards and (PREDICT_OPTIMIZE or PREDICT_QUANTIZED or PREDICT_BACKEND == "onnx"):
+            # warm up every batch shape the server will see so the first request doesn't pay for it
+            _timed("warmup", warmup, [stage1, stage2], batch_sizes=WARMUP_BATCH_SIZES, device=device)
+
+        stage1 = _TimedStage(stage1, "stage1")
+        stage2 = _TimedStage(stage2, "stage2")
+
+        spec = None
+        if PREDICT_LATENCY_MODE == "speculative":
+            spec = SpeculativeCascade(stage1, stage2, threads_per_stage=PREDICT_STAGE_THREADS)
+
+        startup_report["load_s"] = round(time.perf_counter() - t0, 4)
+        startup_report["loaded"] = True
+        _models = LoadedModels(stage1, stage2, version, spec)
+        print(f"Models loaded in {startup_report['load_s']:.2f}s: {startup_report['phases']}")
+        return _models
+
+
+def get_models():
+    return _models if _models is not None else warmup_models()
+
+
+def warmup_worker():
+    """Warmup forwards for a forked serve.py worker, whose allocator and JIT state
+    start cold. Runs the stages without their _TimedStage wrappers, so warmup
+    stays out of the per-stage latency metrics."""
+    models = get_models()
+    stages = [getattr(stage, "model", stage) for stage in (models.stage1, models.stage2)]
+    warmup(stages, batch_sizes=WARMUP_BATCH_SIZES, device=device)
+
+
+def cascade(x):
+    """Run the configured cascade over a batch tensor"""
+    models = get_models()
+    if models.speculative is not None:
+        results = models.speculative(x)
+    else:
+        results = run_cascade(models.stage1, models.stage2, x)
+    CASCADE_ROWS.inc(len(results))
+    STAGE2_ROUTED.inc(sum(1 for label, _ in results if label != CLASS_MAP[1]))
+    return results
+
+
+def _predict_batch(tensors):
+    BATCH_SIZE.observe(len(tensors))
+    return cascade(torch.cat(tensors))
+
+
+batcher = MicroBatcher(_predict_batch, max_batch_size=PREDICT_MAX_BATCH, max_wait_ms=PREDICT_MAX_WAIT_MS)
+metrics.gauge("batcher_queue_depth", "Images waiting for the micro-batching worker", fn=batcher.queue_depth)
+
+# ============ PREDICTION CACHE ============
+# Keyed by decoded pixels + MODEL_VERSION; PREDICT_CACHE_SIZE=0 disables,
+# PREDICT_CACHE_TTL (seconds) expires entries, 0 keeps them until evicted.
+PREDICT_CACHE_SIZE = int(os.environ.get("PREDICT_CACHE_SIZE", 1024))
+PREDICT_CACHE_TTL = float(os.environ.get("PREDICT_CACHE_TTL", 0))
+# PREDICT_COALESCE=1 lets concurrent /api/predict requests for the same image
+# share one cascade run, whether or not the cache is enabled.
+PREDICT_COALESCE = os.environ.get("PREDICT_COALESCE", "1") == "1"
+
+prediction_cache = PredictionCache(max_entries=PREDICT_CACHE_SIZE, ttl=PREDICT_CACHE_TTL)
+metrics.counter("prediction_cache_hits_total", "Prediction cache hits", fn=lambda: prediction_cache.hits)
+metrics.counter("prediction_cache_misses_total", "Prediction cache misses", fn=lambda: prediction_cache.misses)
+single_flight = SingleFlight()
+metrics.counter("prediction_coalesced_total", "Requests that reused a concurrent identical request's cascade run",
+                fn=lambda: single_flight.coalesced)
 
-stage2_model = models.resnet50(pretrained=False)
-stage2_model.conv1 = nn.Conv2d(1, 64, kernel_size=7, stride=2, padding=3, bias=False)
-stage2_model.fc = nn.Linear(stage2_model.fc.in_features, 2)
-stage2_model.load_state_dict(torch.load("best_stage2_model.pth", map_location=device))
-stage2_model.to(device).eval()
+# ============ ADMISSION CONTROL ============
+admission = AdmissionController(PREDICT_MAX_IN_FLIGHT, max_queue=PREDICT_MAX_QUEUE,
+                                timeout=PREDICT_QUEUE_TIMEOUT, retry_after=PREDICT_RETRY_AFTER)
+metrics.gauge("admission_in_flight", "Prediction requests currently admitted", fn=lambda: admission.in_flight)
+metrics.gauge("admission_waiting", "Prediction requests queued for a slot", fn=lambda: admission.waiting)
+ADMISSION_REJECTED = metrics.counter("admission_rejected_total", "Prediction requests turned away with 503",
+                                     labelnames=("reason",))
+
+
+def admission_controlled(view):
+    """Run view only once admitted; overload is answered with 503 before the upload is parsed"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            admission.acquire()
+        except Overloaded as e:
+            ADMISSION_REJECTED.inc(reason=e.reason)
+            resp = jsonify({"success": False, "error": str(e), "admission": admission.stats()})
+            resp.status_code = 503
+            resp.headers["Retry-After"] = str(e.retry_after)
+            return resp
+        try:
+            return view(*args, **kwargs)
+        finally:
+            admission.release()
+    return wrapper
 
-CLASS_MAP = {0: "Hemorrhagic", 1: "Ischemic", 2: "Normal"}
 
 # ============ UTILS ============
-def load_tensor(path):
-    img = Image.open(path).convert("L").resize((224, 224))
-    img = np.array(img) / 255.0
-    tensor = torch.tensor(img).unsqueeze(0).unsqueeze(0).float().to(device)
-    return tensor
+def load_image(src):
+    """Decode src (a path or a binary file object, e.g. an upload stream) to grayscale,
+    downscaling oversized images during decode"""
+    return decode_image(src)
+
+def image_to_tensor(img):
+    return preprocess_image(img).to(device)
+
+def predict_image(img):
+    """Cascade prediction for a decoded image, served from the cache when possible
+    and shared with concurrent requests for the same image.
+    Returns (label, confidence, cached)."""
+    key = content_key(img, get_models().version) if prediction_cache.enabled or PREDICT_COALESCE else None
+    if key is not None and prediction_cache.enabled:
+        hit = prediction_cache.get(key)
+        if hit is not None:
+            return hit[0], hit[1], True
+
+    def compute():
+        with STAGE_SECONDS.time(stage="preprocess"):
+            x = image_to_tensor(img)
+        if PREDICT_MAX_BATCH > 1:
+            label, confidence = batcher.predict(x)
+        else:
+            label, confidence = cascade(x)[0]
+        result = (label, float(confidence))
+        if key is not None:
+            prediction_cache.put(key, result)
+        return result
+
+    if key is not None and PREDICT_COALESCE:
+        (label, confidence), _ = single_flight.do(key, compute)
+    else:
+        label, confidence = compute()
+    return label, confidence, False
 
 def predict_stroke(image_path):
     """Two-stage stroke prediction using stage1 and stage2 models"""
-    x = load_tensor(image_path)
-    
-    # Stage 1
-    out1 = stage1_model(x)
-    p1 = torch.argmax(out1, dim=1).item()
-    
-    if p1 == 1:  # Ischemic
-        final = 1
-        confidence = torch.softmax(out1, dim=1)[0, 1].item()
-    else:
-        # Stage 2
-        out2 = stage2_model(x)
-        p2 = torch.argmax(out2, dim=1).item()
-        final = 0 if p2 == 0 else 2
-        confidence = torch.softmax(out2, dim=1)[0, p2].item()
-    
-    return CLASS_MAP[final], float(confidence)
+    label, confidence, _ = predict_image(load_image(image_path))
+    return label, confidence
+
+def predict_images(imgs, chunk_size=32):
+    """Cascade over decoded images, preprocessed straight into one batch tensor per chunk"""
+    results = []
+    for i in range(0, len(imgs), chunk_size):
+        results.extend(cascade(preprocess_batch(imgs[i:i + chunk_size]).to(device)))
+    return results
+
+def predict_stroke_batch(sources, chunk_size=32):
+    """Two-stage prediction over many images (paths or file objects)"""
+    return predict_images([load_image(src) for src in sources], chunk_size=chunk_size)
 
 
 @app.route("/")
@@ -76,49 +359,171 @@ def verify():
 
 
 @app.route("/api/predict", methods=["POST"])
+@admission_controlled
 def api_predict():
-    if "image" not in request.files:
+    t0 = time.perf_counter()
+    # the multipart body is read and parsed on first access to request.files
+    with STAGE_SECONDS.time(stage="upload"):
+        files = request.files
+    if "image" not in files:
         return jsonify({"success": False, "message": "No image file provided"}), 400
-    f = request.files["image"]
+    f = files["image"]
     if f.filename == "":
         return jsonify({"success": False, "message": "Empty filename"}), 400
 
-    tmpdir = tempfile.gettempdir()
-    filename = f"predict_{uuid.uuid4().hex}.png"
-    path = os.path.join(tmpdir, filename)
-    f.save(path)
-
     try:
-        label, confidence = predict_stroke(path)
-        return jsonify({"success": True, "prediction": label, "confidence": confidence})
+        # decode straight from the in-memory upload buffer
+        with STAGE_SECONDS.time(stage="decode"):
+            img = load_image(f.stream)
+        label, confidence, cached = predict_image(img)
+        PREDICTIONS.inc(label=label)
+        return jsonify({"success": True, "prediction": label, "confidence": confidence, "cached": cached})
     except Exception as e:
+        ERRORS.inc(endpoint="predict")
         return jsonify({"success": False, "error": str(e)}), 500
     finally:
-        try:
-            os.remove(path)
-        except Exception:
-            pass
+        STAGE_SECONDS.observe(time.perf_counter() - t0, stage="total")
+
 
+@app.route("/api/predict/batch", methods=["POST"])
+@admission_controlled
+def api_predict_batch():
+    files = [f for f in request.files.getlist("images") + request.files.getlist("image") if f.filename]
+    if not files:
+        return jsonify({"success": False, "message": "No image files provided"}), 400
 
-def _launch_game():
     try:
-        # use the same python executable running this server
-        python_exec = sys.executable or "python"
-        cwd = os.path.abspath(os.path.dirname(__file__))
-        subprocess.Popen([python_exec, "main.py"], cwd=cwd)
-    except Exception:
-        pass
+        # decode up front so one unreadable file doesn't fail the whole series
+        results = [None] * len(files)
+        good, keys, pending = [], [], []
+        for i, f in enumerate(files):
+            try:
+                img = load_image(f.stream)
+            except Exception as e:
+                results[i] = {"filename": f.filename, "success": False, "error": str(e)}
+                continue
+            key = content_key(img, get_models().version) if prediction_cache.enabled else None
+            hit = prediction_cache.get(key) if key is not None else None
+            if hit is not None:
+                results[i] = {"filename": f.filename, "success": True,
+                              "prediction": hit[0], "confidence": hit[1], "cached": True}
+                continue
+            good.append(i)
+            keys.append(key)
+            pending.append(img)
+
+        preds = predict_images(pending, chunk_size=PREDICT_BATCH_CHUNK)
+        for i, key, (label, confidence) in zip(good, keys, preds):
+            confidence = float(confidence)
+            if key is not None:
+                prediction_cache.put(key, (label, confidence))
+            results[i] = {"filename": files[i].filename, "success": True,
+                          "prediction": label, "confidence": confidence, "cached": False}
+        for r in results:
+            if r["success"]:
+                PREDICTIONS.inc(label=r["prediction"])
+        return jsonify({"success": True, "count": len(results), "results": results})
+    except Exception as e:
+        ERRORS.inc(endpoint="predict_batch")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route(VOLUME_ROUTE, methods=["POST"])
+@admission_controlled
+def api_predict_volume():
+    """Per-slice predictions and a per-volume summary for a multi-page TIFF or .npy upload.
+    The upload is on disk (InMemoryRequest), so .npy slices are memory-mapped and TIFF
+    pages decoded one at a time."""
+    f = request.files.get("volume")
+    if f is None or f.filename == "":
+        return jsonify({"success": False, "message": "No volume file provided"}), 400
+    ext = os.path.splitext(f.filename)[1].lower()
+    if ext not in VOLUME_EXTS:
+        return jsonify({"success": False, "message": f"Unsupported volume type {ext or f.filename!r}"}), 400
+
+    try:
+        result = predict_volume(iter_slices(f.stream, kind=ext.lstrip(".")), cascade,
+                                batch_size=PREDICT_BATCH_CHUNK, device=device)
+        if result["aggregate"]["prediction"] is not None:
+            PREDICTIONS.inc(label=result["aggregate"]["prediction"])
+        return jsonify({"success": True, **result})
+    except Exception as e:
+        ERRORS.inc(endpoint="predict_volume")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    UPLOADS_REJECTED.inc()
+    limit = PREDICT_MAX_VOLUME_MB if request.path == VOLUME_ROUTE else PREDICT_MAX_UPLOAD_MB
+    return jsonify({"success": False, "error": f"Upload exceeds the {limit:g} MB limit"}), 413
+
+
+@app.route("/api/cache/stats")
+def api_cache_stats():
+    stats = prediction_cache.stats()
+    stats["coalesced"] = single_flight.coalesced
+    stats["model_version"] = _models.version if _models is not None else None
+    return jsonify(stats)
+
+
+@app.route("/api/admission")
+def api_admission():
+    return jsonify(admission.stats())
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "alive"})
+
+
+@app.route("/readyz")
+def readyz():
+    """Readiness: both models are loaded and predictions won't pay the load cost"""
+    ready = _models is not None
+    return jsonify({"ready": ready, "loaded": ready}), (200 if ready else 503)
+
+
+@app.route("/api/startup")
+def api_startup():
+    return jsonify(startup_report)
+
+
+# ============ GAME SUPERVISOR ============
+# one warm main.py per station (/play?station=<id>); GAME_STATE_DIR holds the pidfiles
+game_supervisor = GameSupervisor(game_command("main.py"), cwd=os.path.abspath(os.path.dirname(__file__)),
+                                 state_dir=os.environ.get("GAME_STATE_DIR") or None)
+metrics.counter("game_launches_total", "Game processes started by /play", fn=lambda: game_supervisor.launches)
 
 
 @app.route("/play")
 def play():
-    # start the game in background and return a small page telling user it's launched
-    thread = threading.Thread(target=_launch_game, daemon=True)
-    thread.start()
-    return render_template("play_started.html")
+    # start the station's game, or bring its running window to the front (if this process owns it)
+    try:
+        status, action = game_supervisor.launch(request.args.get("station", "default"))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return render_template("play_started.html", action=action, game=status)
+
+
+@app.route("/api/game/status")
+def api_game_status():
+    return jsonify(game_supervisor.status())
+
+
+startup_report["import_s"] = round(time.perf_counter() - _IMPORT_START, 4)
 
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("FLASK_DEBUG", "1") == "1"
+    # with the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if not PREDICT_LAZY_LOAD and (not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
+        warmup_models()
     app.run(host="0.0.0.0", port=port, debug=debug)
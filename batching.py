@@ -0,0 +1,96 @@
+"""
+Dynamic micro-batching for inference requests.
+Requests arriving within a short window are grouped and run as one batch
+on a dedicated worker thread.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Collects concurrent inputs and runs them through fn as one batch"""
+    def __init__(self, fn, max_batch_size=8, max_wait_ms=5.0):
+        """
+        fn: callable taking a list of inputs and returning a list of results
+            in the same order.
+        max_batch_size: upper bound on inputs per call to fn.
+        max_wait_ms: how long the first input of a batch waits for company.
+        """
+        self.fn = fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, name="micro-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(None)
+            thread = self._thread
+        thread.join(timeout)
+
+    def submit(self, item):
+        """Queue one input and return a Future resolving to its result"""
+        self.start()
+        fut = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def queue_depth(self):
+        """Inputs waiting for the worker (not counting the batch in flight)"""
+        return self._queue.qsize()
+
+    def predict(self, item, timeout=None):
+        """Blocking helper: submit and wait for the result"""
+        return self.submit(item).result(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                # put the stop marker back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(nxt)
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            items = [item for item, _ in batch]
+            futures = [fut for _, fut in batch]
+            try:
+                results = list(self.fn(items))
+                if len(results) != len(futures):
+                    raise RuntimeError(f"batch function returned {len(results)} results for {len(futures)} inputs")
+            except Exception as e:
+                for fut in futures:
+                    fut.set_exception(e)
+                continue
+            for fut, res in zip(futures, results):
+                fut.set_result(res)
@@ -0,0 +1,40 @@
+"""
+Overload /api/predict with and without admission control and compare the
+latency of the requests that were served. Rejected requests (503) show up
+as errors; the point is that the served ones keep a bounded tail.
+
+    python benchmarks/bench_admission.py --concurrency 32 --requests 200 --in-flight 4 --queue 8
+"""
+import argparse
+import sys
+
+from load_test import run_benchmark
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the server with and without admission control")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=8)
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args(argv)
+
+    variants = [
+        ("unbounded", {"PREDICT_MAX_IN_FLIGHT": "0"}),
+        (f"admit {args.in_flight}+{args.queue}", {"PREDICT_MAX_IN_FLIGHT": str(args.in_flight),
+                                                  "PREDICT_MAX_QUEUE": str(args.queue)}),
+    ]
+    print(f"{args.requests} requests at concurrency {args.concurrency}")
+    for name, env in variants:
+        run_args = argparse.Namespace(
+            server="app", workers=1, concurrency=args.concurrency, requests=args.requests,
+            warmup=4, sizes=[256], formats=["PNG"], images=64, seed=0, port=args.port)
+        r = run_benchmark(run_args, env)["results"]
+        print(f"{name:14} {r['throughput_rps']:8.2f} served/s  p50 {r['p50_ms']:8.1f} ms  "
+              f"p99 {r['p99_ms']:8.1f} ms  rejected {r['errors']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Per-level VideoCapture versus the shared CameraService, on real hardware.
+
+Reports the camera open cost a level transition pays, and how long the Tk
+update loop is blocked per frame (cap.read() versus reading the latest-frame
+slot) while simulating a level's per-frame work.
+
+    python benchmarks/bench_camera.py --levels 5 --frames 150 --work-ms 15
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2
+
+from camera_service import CameraService
+
+
+def direct(args):
+    opens, blocked = [], []
+    for _ in range(args.levels):
+        t0 = time.perf_counter()
+        cap = cv2.VideoCapture(args.index)
+        ok, _ = cap.read()
+        opens.append(time.perf_counter() - t0)
+        if not ok:
+            raise SystemExit(f"camera {args.index} returned no frames")
+        for _ in range(args.frames // args.levels):
+            t0 = time.perf_counter()
+            cap.read()
+            blocked.append(time.perf_counter() - t0)
+            time.sleep(args.work_ms / 1000)
+        cap.release()
+    return opens, blocked
+
+
+def shared(args):
+    t0 = time.perf_counter()
+    cam = CameraService(args.index).start()
+    while not cam.read(timeout=0.1)[0]:
+        if time.perf_counter() - t0 > 10:
+            raise SystemExit(f"camera {args.index} returned no frames")
+    opens = [time.perf_counter() - t0] + [0.0] * (args.levels - 1)
+    blocked = []
+    for _ in range(args.frames):
+        t0 = time.perf_counter()
+        cam.read()
+        blocked.append(time.perf_counter() - t0)
+        time.sleep(args.work_ms / 1000)
+    stats = cam.stats()
+    cam.stop()
+    return opens, blocked, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-level capture with the shared camera service")
+    parser.add_argument("--index", type=int, default=0)
+    parser.add_argument("--levels", type=int, default=5, help="level transitions to simulate")
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--work-ms", type=float, default=15, help="simulated per-frame tracking/render time")
+    args = parser.parse_args(argv)
+
+    d_open, d_block = direct(args)
+    s_open, s_block, stats = shared(args)
+    ms = lambda v: 1000 * v
+    print(f"{'':10} {'open total ms':>14} {'read p50 ms':>12} {'read max ms':>12}")
+    print(f"{'per-level':10} {ms(sum(d_open)):14.1f} {ms(statistics.median(d_block)):12.2f} {ms(max(d_block)):12.2f}")
+    print(f"{'shared':10} {ms(sum(s_open)):14.1f} {ms(statistics.median(s_block)):12.2f} {ms(max(s_block)):12.2f}")
+    print(f"shared camera: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Full decode versus reduced-resolution decode (stroke_models.decode_image)
+for large JPEG and PNG uploads: time to a (1, 1, 224, 224) tensor and peak
+RSS. Each case runs in its own process so peak RSS is not shared.
+
+    python benchmarks/bench_decode.py --size 4000x3000 --repeat 10
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = [("JPEG", "L"), ("JPEG", "RGB"), ("PNG", "L"), ("PNG", "RGB")]
+
+
+def make_upload(fmt, mode, width, height):
+    """A noisy synthetic scan encoded as it would arrive over HTTP"""
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = (xx + yy) * (127.0 / (width + height)) + rng.normal(0, 20, (height, width)) + 64
+    img = Image.fromarray(np.clip(base, 0, 255).astype(np.uint8)).convert(mode)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return buf.getvalue()
+
+
+def run_case(args):
+    from PIL import Image
+    from stroke_models import decode_image, preprocess_image
+
+    path, variant = args.worker.rsplit(":", 1)
+    with open(path, "rb") as f:
+        data = f.read()
+    if variant == "full":
+        decode = lambda buf: Image.open(buf).convert("L")
+    else:
+        decode = decode_image
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    preprocess_image(decode(io.BytesIO(data)))
+    times = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        preprocess_image(decode(io.BytesIO(data)))
+        times.append((time.perf_counter() - t0) * 1000)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    json.dump({"upload_kb": len(data) / 1024, "median_ms": sorted(times)[len(times) // 2],
+               "peak_rss_mb": peak / 1024, "decode_growth_mb": max(0, peak - before) / 1024}, sys.stdout)
+
+
+def _size(s):
+    w, h = s.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare full and reduced-resolution decoding")
+    parser.add_argument("--size", type=_size, default=(4000, 3000), help="WIDTHxHEIGHT of the upload")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_case(args)
+        return 0
+
+    base = [sys.executable, os.path.abspath(__file__), "--repeat", str(args.repeat)]
+    print(f"{args.size[0]}x{args.size[1]} uploads, median of {args.repeat}")
+    print(f"{'case':12} {'upload KB':>10} {'full ms':>9} {'reduced ms':>11} {'full MB':>9} {'reduced MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, mode in CASES:
+            # encoded once here so the workers' peak RSS only reflects decoding
+            path = os.path.join(tmp, f"upload_{mode}.{fmt.lower()}")
+            with open(path, "wb") as f:
+                f.write(make_upload(fmt, mode, *args.size))
+            out = {}
+            for variant in ("full", "reduced"):
+                proc = subprocess.run(base + ["--worker", f"{path}:{variant}"],
+                                      capture_output=True, text=True, check=True)
+                out[variant] = json.loads(proc.stdout)
+            full, red = out["full"], out["reduced"]
+            print(f"{fmt + ' ' + mode:12} {full['upload_kb']:10.0f} {full['median_ms']:9.1f} "
+                  f"{red['median_ms']:11.1f} {full['decode_growth_mb']:9.1f} {red['decode_growth_mb']:11.1f}")
+    print("MB columns: peak RSS growth from decoding, on top of the process holding the encoded upload")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Fixed root.after(10, update) polling versus FrameScheduler, on a small
+stand-in for Tk's event loop (no display needed).
+
+A fake camera delivers frames at --camera-fps. Each frame runs "inference"
+(--infer-ms, with a --spike-ms spike every --spike-every frames) plus
+--render-ms of drawing. Reports update callbacks per second (polls included),
+frames shown per second, inference runs, late/dropped frames and the CPU
+time the loop used.
+
+    python benchmarks/bench_frame_pacing.py --camera-fps 15 --seconds 10
+"""
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from frame_scheduler import FrameScheduler
+
+
+class MiniLoop:
+    """after()/after_cancel()/mainloop() with Tk's millisecond timers"""
+    def __init__(self):
+        self._timers = []
+        self._ids = itertools.count(1)
+        self._cancelled = set()
+        self.callbacks = 0
+
+    def after(self, ms, fn, *args):
+        after_id = next(self._ids)
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, after_id, fn, args))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def mainloop(self, seconds):
+        end = time.perf_counter() + seconds
+        while self._timers and time.perf_counter() < end:
+            due, after_id, fn, args = heapq.heappop(self._timers)
+            if after_id in self._cancelled:
+                continue
+            time.sleep(max(0.0, due - time.perf_counter()))
+            self.callbacks += 1
+            fn(*args)
+
+
+class FakeCamera:
+    def __init__(self, fps):
+        self.interval = 1 / fps
+        self.t0 = time.perf_counter()
+        self.last = -1
+
+    def read(self):
+        n = int((time.perf_counter() - self.t0) / self.interval)
+        if n == self.last:
+            return False, None
+        self.last = n
+        return True, n
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def run(mode, args):
+    loop, cam = MiniLoop(), FakeCamera(args.camera_fps)
+    pacer = FrameScheduler(loop, target_fps=args.target_fps)
+    counts = {"frames": 0, "inferences": 0}
+
+    def update():
+        ok, n = cam.read()
+        if not ok:
+            if mode == "fixed":
+                loop.after(10, update)
+            else:
+                pacer.retry(update)
+            return
+        counts["frames"] += 1
+        if mode == "fixed" or not pacer.skip_inference():
+            counts["inferences"] += 1
+            busy(args.infer_ms + (args.spike_ms if n % args.spike_every == 0 else 0))
+        busy(args.render_ms)
+        if mode == "fixed":
+            loop.after(10, update)
+        else:
+            pacer.next(update)
+
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    if mode == "fixed":
+        loop.after(0, update)
+    else:
+        loop.after(0, pacer.start, update)
+    loop.mainloop(args.seconds)
+    elapsed = time.perf_counter() - t0
+    result = {"mode": mode, "callbacks_s": round(loop.callbacks / elapsed, 1),
+              "fps": round(counts["frames"] / elapsed, 1), "inferences": counts["inferences"],
+              "cpu_s": round(time.process_time() - cpu0, 2)}
+    if mode == "paced":
+        stats = pacer.stats()
+        result.update(late=stats["late"], dropped=stats["dropped"], skipped_inference=stats["skipped_inference"])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fixed 10 ms polling with FrameScheduler")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--camera-fps", type=float, default=30)
+    parser.add_argument("--target-fps", type=float, default=30)
+    parser.add_argument("--infer-ms", type=float, default=15)
+    parser.add_argument("--render-ms", type=float, default=5)
+    parser.add_argument("--spike-ms", type=float, default=40)
+    parser.add_argument("--spike-every", type=int, default=10)
+    args = parser.parse_args(argv)
+    for mode in ("fixed", "paced"):
+        print(run(mode, args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Level-switch cost of building a new MediaPipe Hands graph per level (the old
+behaviour, including the graphs levels never closed) versus reusing the
+pooled graph from hand_tracking.HandsPool, with and without restarting it. Reports per-switch latency and
+process RSS, which includes MediaPipe's native allocations.
+
+    python benchmarks/bench_level_switch.py --switches 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from hand_tracking import HandsPool
+
+CONFIG = dict(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+# levels 3 and 4 never closed their graphs
+LEAKY_LEVELS = {3, 4}
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def run(mode, switches, frames):
+    import mediapipe as mp
+    rgb = np.zeros((480, 640, 3), dtype=np.uint8)
+    pool = HandsPool(restart_graphs=(mode == "pool-restart"))
+    start_rss = rss_mb()
+    times = []
+    for i in range(switches):
+        level = i % 10 + 1
+        t0 = time.perf_counter()
+        if mode == "fresh":
+            hands = mp.solutions.hands.Hands(**CONFIG)
+        else:
+            hands = pool.acquire(**CONFIG)
+        hands.process(rgb)  # a level switch ends when the first frame is tracked
+        times.append((time.perf_counter() - t0) * 1000)
+        for _ in range(frames):
+            if mode != "fresh":
+                hands.next_frame()
+            hands.process(rgb)
+        if mode != "fresh" or level not in LEAKY_LEVELS:
+            hands.close()
+    return times, start_rss, rss_mb()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-level Hands graphs with the shared pool")
+    parser.add_argument("--switches", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=10, help="frames tracked per level")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(run(args.worker, args.switches, args.frames), sys.stdout)
+        return 0
+
+    print(f"{'':12} {'switch p50 ms':>14} {'switch max ms':>14} {'rss before':>11} {'rss after':>10}")
+    for mode in ("fresh", "pool-restart", "pool"):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", mode,
+                               "--switches", str(args.switches), "--frames", str(args.frames)],
+                              capture_output=True, text=True, check=True)
+        times, before, after = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{mode:12} {statistics.median(times):14.1f} {max(times):14.1f} {before:11.1f} {after:10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
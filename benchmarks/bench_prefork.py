@@ -0,0 +1,35 @@
+"""
+Load-test the single-process Flask server (app.py) against the pre-fork
+server (serve.py) with random stand-in weights.
+
+    python benchmarks/bench_prefork.py --workers 4 --concurrency 16 --requests 200
+"""
+import argparse
+import os
+import sys
+
+from load_test import run_benchmark
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare app.py and serve.py under load")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args(argv)
+
+    print(f"{args.requests} requests at concurrency {args.concurrency}")
+    for server in ("app", "prefork"):
+        run_args = argparse.Namespace(
+            server=server, workers=args.workers, concurrency=args.concurrency, requests=args.requests,
+            warmup=args.concurrency, sizes=[256], formats=["PNG"], images=64, seed=0, port=args.port)
+        r = run_benchmark(run_args)["results"]
+        name = "single-process" if server == "app" else f"prefork x{args.workers}"
+        print(f"{name:14} {r['throughput_rps']:8.2f} req/s  p50 {r['p50_ms']:8.1f} ms  "
+              f"p99 {r['p99_ms']:8.1f} ms  peak RSS {r['peak_rss_mb']:7.1f} MB  errors {r['errors']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of the load_tensor preprocessing step.
+
+legacy:  np.array(img) / 255.0 (float64) -> torch.tensor copy -> .float()
+float32: uint8 pixels scaled straight into a float32 tensor
+batch:   the same, written into rows of one preallocated batch tensor
+         (legacy batching stacks per-image tensors with torch.cat)
+
+    python benchmarks/bench_preprocess.py --batch 32 --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import torch
+from PIL import Image
+
+from stroke_models import preprocess_image, preprocess_batch
+
+
+def legacy(img):
+    img = np.array(img) / 255.0
+    return torch.tensor(img).unsqueeze(0).unsqueeze(0).float()
+
+
+def legacy_batch(imgs):
+    return torch.cat([legacy(img) for img in imgs])
+
+
+def bench(fn, arg, repeat):
+    fn(arg)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    per_call = (time.perf_counter() - t0) / repeat * 1e6
+    # numpy allocations are traced; torch's own allocator is not, so add the result size
+    tracemalloc.start()
+    out = fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak + out.numel() * out.element_size()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare preprocessing paths")
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    imgs = [Image.fromarray(rng.integers(0, 256, (224, 224), dtype=np.uint8)) for _ in range(args.batch)]
+
+    rows = [
+        ("legacy, 1 image", legacy, imgs[0], 1),
+        ("float32, 1 image", preprocess_image, imgs[0], 1),
+        (f"legacy + cat, {args.batch} images", legacy_batch, imgs, args.batch),
+        (f"preallocated, {args.batch} images", preprocess_batch, imgs, args.batch),
+    ]
+    print(f"{'path':32} {'us/image':>10} {'peak KiB/image':>15}")
+    for name, fn, arg, n in rows:
+        us, peak = bench(fn, arg, max(1, args.repeat // n))
+        print(f"{name:32} {us / n:10.1f} {peak / n / 1024:15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
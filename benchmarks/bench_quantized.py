@@ -0,0 +1,96 @@
+"""
+FP32 versus INT8 cascade: per-image latency, peak memory and agreement with
+the FP32 predictions.
+
+Each variant runs in its own process so peak RSS is not shared.
+
+    python quantize_models.py --calib-dir scans/
+    python benchmarks/bench_quantized.py --images scans/ --limit 200
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def run_variant(args):
+    import torch
+    from PIL import Image
+    from stroke_models import load_classifier, preprocess_image, run_cascade
+    from quantize_models import list_images, load_quantized_classifier
+
+    torch.set_num_threads(args.threads)
+    if args.worker == "int8":
+        stage1 = load_quantized_classifier(args.stage1_int8)
+        stage2 = load_quantized_classifier(args.stage2_int8)
+    else:
+        stage1 = load_classifier(args.stage1)
+        stage2 = load_classifier(args.stage2)
+
+    paths = list_images(args.images, args.limit)
+    inputs = []
+    for p in paths:
+        try:
+            with Image.open(p) as img:
+                inputs.append(preprocess_image(img))
+        except Exception:
+            continue
+    run_cascade(stage1, stage2, inputs[0])  # warmup
+
+    latencies, labels = [], []
+    for x in inputs:
+        t0 = time.perf_counter()
+        label, _ = run_cascade(stage1, stage2, x)[0]
+        latencies.append((time.perf_counter() - t0) * 1000)
+        labels.append(label)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    json.dump({"latencies_ms": latencies, "labels": labels, "peak_rss_mb": peak_kb / 1024}, sys.stdout)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare FP32 and INT8 stroke classifiers")
+    parser.add_argument("--images", required=True, help="folder of evaluation scans")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--stage1", default="best_stage1_model.pth")
+    parser.add_argument("--stage2", default="best_stage2_model.pth")
+    parser.add_argument("--stage1-int8", default="best_stage1_model_int8.pt")
+    parser.add_argument("--stage2-int8", default="best_stage2_model_int8.pt")
+    parser.add_argument("--worker", choices=["fp32", "int8"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_variant(args)
+        return 0
+
+    base = [sys.executable, os.path.abspath(__file__)] + (argv if argv is not None else sys.argv[1:])
+    out = {}
+    for variant in ("fp32", "int8"):
+        proc = subprocess.run(base + ["--worker", variant], capture_output=True, text=True, check=True)
+        out[variant] = json.loads(proc.stdout)
+
+    n = len(out["fp32"]["labels"])
+    agree = sum(a == b for a, b in zip(out["fp32"]["labels"], out["int8"]["labels"]))
+    print(f"{n} images, {args.threads} thread(s)")
+    print(f"{'variant':8} {'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+    for variant in ("fp32", "int8"):
+        lat = out[variant]["latencies_ms"]
+        print(f"{variant:8} {percentile(lat, 50):9.2f} {percentile(lat, 99):9.2f} {out[variant]['peak_rss_mb']:12.1f}")
+    print(f"agreement with FP32: {agree}/{n} ({agree / n * 100:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Per-frame canvas rendering: the old path (cvtColor -> Image.fromarray ->
+new ImageTk.PhotoImage -> new canvas item every frame) versus
+canvas_renderer.CanvasRenderer (one PhotoImage and item updated in place).
+
+The pixel path (colour conversion into a PIL image) is always measured,
+with tracemalloc counting bytes allocated per frame. With a display, the
+full Tk path is run as well. It reports per-frame ms over the first and last
+10% of frames, the canvas item count and process RSS, to show whether the
+cost stays flat over a long session.
+
+    python benchmarks/bench_render.py --frames 3000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from canvas_renderer import CanvasRenderer
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def frames(n, shape=(480, 640, 3)):
+    base = np.random.default_rng(0).integers(0, 255, shape, dtype=np.uint8)
+    for i in range(n):
+        yield np.roll(base, i, axis=1)
+
+
+def pixel_path(n):
+    out = {}
+    image = Image.new("RGB", (640, 480))
+    paths = {
+        "old": lambda f: Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)),
+        "in-place": lambda f: image.frombytes(f, "raw", "BGR"),
+    }
+    for name, fn in paths.items():
+        pending = list(frames(n))
+        times = []
+        tracemalloc.start()
+        for f in pending:
+            t0 = time.perf_counter()
+            fn(f)
+            times.append((time.perf_counter() - t0) * 1000)
+        total = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        out[name] = {"ms_p50": round(statistics.median(times), 3), "peak_alloc_kb": round(total[1] / 1024, 1)}
+    return out
+
+
+def tk_path(n):
+    import tkinter as tk
+    from PIL import ImageTk
+    root = tk.Tk()
+    results = {}
+    for name in ("old", "in-place"):
+        canvas = tk.Canvas(root, width=640, height=480)
+        canvas.pack()
+        renderer = CanvasRenderer(canvas)
+        times, rss_start = [], rss_mb()
+        for f in frames(n):
+            t0 = time.perf_counter()
+            if name == "old":
+                imgtk = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB)))
+                canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
+                canvas.imgtk = imgtk
+            else:
+                renderer.show(f)
+            root.update_idletasks()
+            times.append((time.perf_counter() - t0) * 1000)
+        k = max(1, n // 10)
+        results[name] = {"first_ms": round(statistics.median(times[:k]), 3),
+                         "last_ms": round(statistics.median(times[-k:]), 3),
+                         "canvas_items": len(canvas.find_all()),
+                         "rss_mb": (round(rss_start, 1), round(rss_mb(), 1))}
+        canvas.destroy()
+    root.destroy()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-frame PhotoImage creation with in-place rendering")
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args(argv)
+    print("pixel path", pixel_path(min(args.frames, 500)))
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        print("no display: skipping the Tk path")
+        return 0
+    print("tk path", tk_path(args.frames))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Full-frame MediaPipe Hands versus hand_tracking.RoiHands (inference on a
+crop around the previous frame's hands).
+
+With --video (a recording of someone playing, or a camera index), both run
+over the same frames. It reports ms per frame, how many frames used the crop
+and how far the ROI landmarks were from the full-frame ones, in pixels.
+Without footage, it times Hands.process on full camera frames against the
+crop sizes RoiHands uses, on frames with no hand in them.
+
+    python benchmarks/bench_roi.py --video session.mp4
+    python benchmarks/bench_roi.py --frames 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2
+import numpy as np
+
+from hand_tracking import RoiHands, _mediapipe_hands
+
+CONFIG = dict(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def landmarks_px(results, w, h):
+    if not results.multi_hand_landmarks:
+        return None
+    return np.array([(p.x * w, p.y * h) for p in results.multi_hand_landmarks[0].landmark])
+
+
+def compare_video(source, limit):
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    full = _mediapipe_hands(**CONFIG)
+    roi = RoiHands(_mediapipe_hands(**CONFIG), _mediapipe_hands(**CONFIG))
+    full_ms, roi_ms, errors = [], [], []
+    n = 0
+    while n < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        h, w = rgb.shape[:2]
+        ref, ms = timed(full.process, rgb)
+        full_ms.append(ms)
+        ref = landmarks_px(ref, w, h)
+        res, ms = timed(roi.process, rgb)
+        roi_ms.append(ms)
+        got = landmarks_px(res, w, h)
+        if ref is not None and got is not None:
+            errors.append(float(np.abs(ref - got).mean()))
+        n += 1
+    cap.release()
+    if not n:
+        raise SystemExit(f"no frames from {source}")
+    print(f"{n} frames  full {statistics.median(full_ms):.2f} ms  roi {statistics.median(roi_ms):.2f} ms (p50)")
+    print(f"roi {roi.stats()}  landmark diff vs full frame "
+          f"{statistics.median(errors) if errors else float('nan'):.2f} px (p50)")
+
+
+def size_sweep(frames):
+    rng = np.random.default_rng(0)
+    full = cv2.GaussianBlur(rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8), (31, 31), 0)
+    for h, w in ((720, 1280), (480, 640), (256, 256), (192, 192), (128, 128)):
+        hands = _mediapipe_hands(**CONFIG)
+        img = np.ascontiguousarray(full[:h, :w])
+        hands.process(img)
+        times = [timed(hands.process, img)[1] for _ in range(frames)]
+        hands.close()
+        print(f"{w}x{h:<5} {statistics.median(times):6.2f} ms p50  {np.percentile(times, 99):6.2f} ms p99")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare full-frame and ROI hand tracking")
+    parser.add_argument("--video", help="video file or camera index")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args(argv)
+    if args.video:
+        compare_video(args.video, args.frames)
+    else:
+        size_sweep(args.frames)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
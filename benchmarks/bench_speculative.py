@@ -0,0 +1,82 @@
+"""
+Single-request latency of the sequential cascade versus the speculative
+mode that runs both stages at once.
+
+Uses the real checkpoints when present, otherwise random stand-in weights.
+Latency in sequential mode depends on the stage 1 outcome, so results are
+also split by whether stage 2 was needed.
+
+    python benchmarks/bench_speculative.py --runs 100 --threads 4
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import torch
+
+from stroke_models import build_classifier, load_classifier, run_cascade, SpeculativeCascade
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def load_or_random(path, seed):
+    if os.path.exists(path):
+        return load_classifier(path)
+    torch.manual_seed(seed)
+    return build_classifier().eval()
+
+
+def timed(fn, inputs):
+    fn(inputs[0])
+    lat = []
+    for x in inputs:
+        t0 = time.perf_counter()
+        fn(x)
+        lat.append((time.perf_counter() - t0) * 1000)
+    return lat
+
+
+def report(name, lat):
+    if lat:
+        print(f"  {name:28} n={len(lat):4d}  p50 {percentile(lat, 50):8.2f} ms  p99 {percentile(lat, 99):8.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sequential and speculative cascade latency")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads(), help="total intra-op threads")
+    parser.add_argument("--stage1", default="best_stage1_model.pth")
+    parser.add_argument("--stage2", default="best_stage2_model.pth")
+    args = parser.parse_args(argv)
+
+    stage1 = load_or_random(args.stage1, 1)
+    stage2 = load_or_random(args.stage2, 2)
+    torch.manual_seed(0)
+    inputs = [torch.rand(1, 1, 224, 224) for _ in range(args.runs)]
+    with torch.inference_mode():
+        routed = [int(stage1(x).argmax(dim=1)) != 1 for x in inputs]
+
+    torch.set_num_threads(args.threads)
+    seq = timed(lambda x: run_cascade(stage1, stage2, x), inputs)
+    spec_cascade = SpeculativeCascade(stage1, stage2, threads_per_stage=max(1, args.threads // 2))
+    spec = timed(spec_cascade, inputs)
+    spec_cascade.shutdown()
+
+    print(f"{args.runs} single-image requests, {args.threads} thread(s) total")
+    for name, lat in (("sequential", seq), ("speculative", spec)):
+        print(name)
+        report("all", lat)
+        report("needed stage 2", [t for t, r in zip(lat, routed) if r])
+        report("stopped at stage 1", [t for t, r in zip(lat, routed) if not r])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+In-process MediaPipe (the pooled graph on the Tk thread) versus the tracking
+worker process (tracking_worker.RemoteHandsPool), in a simulated level loop.
+
+Frames arrive at --camera-fps. Each loop iteration does what a level's
+update() does: take the newest frame, flip it, get landmarks, then spend
+--render-ms on drawing/Tk work before scheduling itself again 10 ms later.
+Reports achieved loop FPS, how long each new frame blocked the UI thread,
+and how old the landmarks were when the loop used them.
+
+    python benchmarks/bench_tracking.py --seconds 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2
+import numpy as np
+
+from hand_tracking import HandsPool
+from tracking_worker import RemoteHandsPool
+
+CONFIG = dict(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+
+
+def synthetic_frames(n=30, shape=(480, 640, 3)):
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, shape, dtype=np.uint8), (31, 31), 0)
+    return [np.roll(base, i * 8, axis=1) for i in range(n)]
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+def run(mode, args):
+    pool = RemoteHandsPool() if mode == "process" else HandsPool()
+    hands = pool.acquire(**CONFIG)
+    frames = synthetic_frames()
+    if mode == "process":
+        pool.client.wait_ready()
+    # first frame builds/warms the graph in both modes
+    hands.process_bgr(frames[0])
+    time.sleep(0.5)
+
+    blocked, landmark_age, captured = [], [], {}
+    start = time.perf_counter()
+    iterations = new_frames = 0
+    last_frame = -1
+    while time.perf_counter() - start < args.seconds:
+        t0 = time.perf_counter()
+        idx = int((t0 - start) * args.camera_fps)
+        if idx != last_frame:
+            last_frame = idx
+            new_frames += 1
+            frame = cv2.flip(frames[idx % len(frames)], 1)
+            hands.next_frame()
+            capture_t = start + idx / args.camera_fps
+            results = hands.process_bgr(frame)
+            now = time.perf_counter()
+            if mode == "process":
+                # landmarks belong to the newest frame the worker finished, usually an earlier one
+                captured[pool.client.submitted] = capture_t
+                if results.frame_seq in captured:
+                    landmark_age.append((now - captured[results.frame_seq]) * 1000)
+            else:
+                landmark_age.append((now - capture_t) * 1000)
+            busy_until = time.perf_counter() + args.render_ms / 1000
+            while time.perf_counter() < busy_until:
+                pass
+            blocked.append((time.perf_counter() - t0) * 1000)
+        iterations += 1
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.close()
+    return {
+        "mode": mode,
+        "loop_fps": round(iterations / elapsed, 1),
+        "frames_fps": round(new_frames / elapsed, 1),
+        "blocked_ms_p50": round(pct(blocked, 0.5), 2),
+        "blocked_ms_p99": round(pct(blocked, 0.99), 2),
+        "blocked_ms_max": round(max(blocked), 2),
+        "landmark_age_ms_p50": round(statistics.median(landmark_age), 2) if landmark_age else None,
+        "landmark_age_ms_p99": round(pct(landmark_age, 0.99), 2) if landmark_age else None,
+        "pool": stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare in-process and worker-process hand tracking")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--camera-fps", type=float, default=30)
+    parser.add_argument("--render-ms", type=float, default=4, help="simulated drawing/Tk work per frame")
+    parser.add_argument("--modes", nargs="+", default=["inprocess", "process"], choices=["inprocess", "process"])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = [run(mode, args) for mode in args.modes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for r in results:
+        print(f"{r['mode']:10} loop {r['loop_fps']:5.1f}/s  frames {r['frames_fps']:4.1f}/s  "
+              f"UI blocked p50 {r['blocked_ms_p50']:6.2f} p99 {r['blocked_ms_p99']:6.2f} "
+              f"max {r['blocked_ms_max']:6.2f} ms  landmark age p50 {r['landmark_age_ms_p50']} "
+              f"p99 {r['landmark_age_ms_p99']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
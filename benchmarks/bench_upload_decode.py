@@ -0,0 +1,75 @@
+"""
+Per-request cost of the old temp-file upload path versus decoding straight
+from the request buffer.
+
+    python benchmarks/bench_upload_decode.py --size 512 --repeat 200
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import torch
+from PIL import Image
+
+
+def load_tensor(src):
+    # the original app.load_tensor preprocessing, without importing the models
+    img = Image.open(src).convert("L").resize((224, 224))
+    img = np.array(img) / 255.0
+    return torch.tensor(img).unsqueeze(0).unsqueeze(0).float()
+
+
+def via_tempfile(payload):
+    # old api_predict: FileStorage.save -> Image.open(path) -> os.remove
+    path = os.path.join(tempfile.gettempdir(), f"predict_{uuid.uuid4().hex}.png")
+    with open(path, "wb") as f:
+        f.write(payload)
+    try:
+        return load_tensor(path)
+    finally:
+        os.remove(path)
+
+
+def in_memory(payload):
+    return load_tensor(io.BytesIO(payload))
+
+
+def bench(fn, payload, repeat):
+    fn(payload)
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(payload)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return times[len(times) // 2] * 1000, sum(times) / len(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=512, help="edge length of the synthetic scan")
+    parser.add_argument("--format", default="PNG", choices=["PNG", "JPEG"])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 256, (args.size, args.size), dtype=np.uint8))
+    buf = io.BytesIO()
+    img.save(buf, format=args.format)
+    payload = buf.getvalue()
+
+    print(f"{args.format} {args.size}x{args.size}, {len(payload) / 1024:.0f} KiB, {args.repeat} runs")
+    med_tmp, mean_tmp = bench(via_tempfile, payload, args.repeat)
+    med_mem, mean_mem = bench(in_memory, payload, args.repeat)
+    print(f"  temp file : median {med_tmp:7.3f} ms  mean {mean_tmp:7.3f} ms")
+    print(f"  in memory : median {med_mem:7.3f} ms  mean {mean_mem:7.3f} ms")
+    print(f"  saved     : {med_tmp - med_mem:7.3f} ms per request (median)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Reproducible load test for the prediction server.
+
+Starts app.py (or serve.py) with randomly initialized ResNet50 stand-in
+weights, drives /api/predict with synthetic grayscale scans of varied sizes
+and formats at a fixed concurrency, and reports throughput, p50/p95/p99
+latency and the server's peak RSS. Results can be saved as a JSON baseline
+and later runs compared against it.
+
+    python benchmarks/load_test.py --concurrency 8 --requests 200 --save benchmarks/baseline.json
+    python benchmarks/load_test.py --concurrency 8 --requests 200 --compare benchmarks/baseline.json
+    python benchmarks/load_test.py --server prefork --workers 4 --env PREDICT_OPTIMIZE=trace
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONTENT_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "BMP": "image/bmp", "TIFF": "image/tiff"}
+
+
+def make_checkpoints(folder, seed=0):
+    """Random stand-in weights with the production architecture"""
+    import torch
+    from stroke_models import build_classifier
+    paths = []
+    for i in (1, 2):
+        torch.manual_seed(seed + i)
+        path = os.path.join(folder, f"stage{i}.pth")
+        torch.save(build_classifier().state_dict(), path)
+        paths.append(path)
+    return paths
+
+
+def make_payloads(sizes, formats, count, seed=0):
+    """Synthetic grayscale scans: a smooth gradient plus noise, cycling sizes and formats"""
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for i in range(count):
+        size = sizes[i % len(sizes)]
+        fmt = formats[(i // len(sizes)) % len(formats)]
+        yy, xx = np.mgrid[0:size, 0:size]
+        base = (xx + yy) * (127.0 / max(1, 2 * size - 2))
+        noise = rng.normal(0, 30, (size, size))
+        img = Image.fromarray(np.clip(base + noise + 64, 0, 255).astype(np.uint8), mode="L")
+        buf = io.BytesIO()
+        img.save(buf, format=fmt)
+        payloads.append((f"scan{i}.{fmt.lower()}", CONTENT_TYPES[fmt], buf.getvalue()))
+    return payloads
+
+
+def post_image(url, payload, timeout=300):
+    filename, content_type, data = payload
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n").encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    req = urllib.request.Request(url, data=body, method="POST",
+                                 headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        resp.read()
+        return resp.status
+
+
+def wait_ready(base, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base + "/readyz", timeout=2) as resp:
+                if resp.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def run_load(url, payloads, concurrency, total):
+    """Send total requests from concurrency threads; returns (latencies_ms, errors, elapsed_s)"""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                post_image(url, payloads[i % len(payloads)])
+                with lock:
+                    latencies.append((time.perf_counter() - t0) * 1000)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))] if values else float("nan")
+
+
+def _tree_rss_bytes(pid):
+    """RSS of pid and all of its descendants (Linux /proc, psutil elsewhere)"""
+    try:
+        import psutil
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs if p.is_running())
+    except ImportError:
+        pass
+    except Exception:
+        return 0
+    total, todo = 0, [pid]
+    while todo:
+        p = todo.pop()
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            with open(f"/proc/{p}/task/{p}/children") as f:
+                todo.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return total
+
+
+class RssSampler:
+    """Polls the server's process-tree RSS in the background and keeps the peak"""
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _tree_rss_bytes(self.pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def start_server(kind, env, workers):
+    if kind == "prefork":
+        cmd = [sys.executable, "serve.py", "--workers", str(workers)]
+    else:
+        cmd = [sys.executable, "app.py"]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_benchmark(args, extra_env=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        stage1, stage2 = make_checkpoints(tmp, seed=args.seed)
+        env = dict(os.environ, STAGE1_CHECKPOINT=stage1, STAGE2_CHECKPOINT=stage2, FLASK_DEBUG="0",
+                   PORT=str(args.port), PREDICT_CACHE_SIZE="0", PYTHONWARNINGS="ignore")
+        env.update(extra_env or {})
+        payloads = make_payloads(args.sizes, args.formats, args.images, seed=args.seed)
+
+        proc = start_server(args.server, env, args.workers)
+        try:
+            base = f"http://127.0.0.1:{args.port}"
+            if not wait_ready(base):
+                raise RuntimeError("server did not become ready")
+            url = base + "/api/predict"
+            with RssSampler(proc.pid) as rss:
+                run_load(url, payloads, args.concurrency, args.warmup)
+                lat, errors, elapsed = run_load(url, payloads, args.concurrency, args.requests)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+
+    return {
+        "config": {
+            "server": args.server, "workers": args.workers if args.server == "prefork" else 1,
+            "concurrency": args.concurrency, "requests": args.requests, "warmup": args.warmup,
+            "sizes": args.sizes, "formats": args.formats, "images": args.images, "seed": args.seed,
+            "env": extra_env or {},
+        },
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "results": {
+            "throughput_rps": round(len(lat) / elapsed, 3) if elapsed else 0.0,
+            "p50_ms": round(percentile(lat, 50), 2),
+            "p95_ms": round(percentile(lat, 95), 2),
+            "p99_ms": round(percentile(lat, 99), 2),
+            "errors": len(errors),
+            "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+        },
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return human-readable regressions beyond tolerance (a fraction)"""
+    cur, base = current["results"], baseline["results"]
+    problems = []
+    if cur["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+        problems.append(f"throughput {cur['throughput_rps']} < baseline {base['throughput_rps']}")
+    for key in ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"):
+        if cur[key] > base[key] * (1 + tolerance):
+            problems.append(f"{key} {cur[key]} > baseline {base[key]}")
+    if cur["errors"] > base["errors"]:
+        problems.append(f"errors {cur['errors']} > baseline {base['errors']}")
+    return problems
+
+
+def _csv(cast):
+    return lambda s: [cast(v) for v in s.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test /api/predict with stand-in weights")
+    parser.add_argument("--server", choices=["app", "prefork"], default="app")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="prefork workers")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=8, help="untimed requests sent first")
+    parser.add_argument("--sizes", type=_csv(int), default=[256, 512, 1024])
+    parser.add_argument("--formats", type=_csv(str.upper), default=["PNG", "JPEG"])
+    parser.add_argument("--images", type=int, default=32, help="distinct synthetic images")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra server environment, e.g. PREDICT_OPTIMIZE=trace")
+    parser.add_argument("--save", help="write the result JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression fraction")
+    args = parser.parse_args(argv)
+
+    extra_env = dict(kv.split("=", 1) for kv in args.env)
+    result = run_benchmark(args, extra_env)
+    print(json.dumps(result, indent=2))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(result, json.load(f), args.tolerance)
+        if problems:
+            print("REGRESSIONS:\n  " + "\n  ".join(problems))
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
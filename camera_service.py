@@ -0,0 +1,141 @@
+"""
+Shared webcam capture for all levels.
+A background thread reads the camera continuously and keeps only the newest
+frame, so the Tk update loop never blocks on cap.read() and never processes
+a stale buffered frame. The camera is opened once (main.py starts it at
+launch) and stays open across level transitions.
+"""
+import os
+import threading
+import time
+
+import cv2
+
+CAMERA_INDEX = int(os.environ.get("CAMERA_INDEX", 0))
+
+
+class CameraService:
+    """Latest-frame slot filled by a capture thread"""
+    def __init__(self, index=CAMERA_INDEX, capture_factory=cv2.VideoCapture, reopen_after=30):
+        """
+        index: camera index passed to capture_factory.
+        reopen_after: consecutive failed reads before the camera is reopened.
+        """
+        self.index = index
+        self.capture_factory = capture_factory
+        self.reopen_after = reopen_after
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._read_seq = 0
+        self._running = False
+        self._thread = None
+        self.open_s = None
+        self.frames = 0
+        self.dropped = 0
+        self.failed_reads = 0
+        self._fps = 0.0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="camera", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _open(self):
+        t0 = time.perf_counter()
+        cap = self.capture_factory(self.index)
+        try:
+            # keep the driver from queueing frames behind the one we want
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+        self.open_s = round(time.perf_counter() - t0, 3)
+        return cap
+
+    def _run(self):
+        cap = self._open()
+        failures = 0
+        last = time.perf_counter()
+        while self._running:
+            ok, frame = cap.read()
+            if not ok or frame is None:
+                failures += 1
+                self.failed_reads += 1
+                if failures >= self.reopen_after:
+                    cap.release()
+                    time.sleep(0.5)
+                    cap = self._open()
+                    failures = 0
+                else:
+                    time.sleep(0.01)
+                continue
+            failures = 0
+            now = time.perf_counter()
+            with self._cond:
+                if self._seq > self._read_seq:
+                    self.dropped += 1
+                self._frame = frame
+                self._seq += 1
+                self.frames += 1
+                self._fps = 0.9 * self._fps + 0.1 / max(now - last, 1e-6)
+                self._cond.notify_all()
+            last = now
+        cap.release()
+
+    def read(self, timeout=0.0):
+        """
+        (ok, frame) like cv2.VideoCapture.read, but returns the newest frame
+        not handed out yet. Waits up to timeout seconds for one; (False, None)
+        when nothing new arrived. Frames are shared, so copy before drawing
+        on one in place (cv2.flip already returns a new array).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._seq == self._read_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return False, None
+                self._cond.wait(remaining)
+            self._read_seq = self._seq
+            return True, self._frame
+
+    def release(self):
+        """Kept for cv2.VideoCapture compatibility; the shared camera stays open"""
+
+    def stats(self):
+        with self._cond:
+            return {"running": self._running, "open_s": self.open_s, "frames": self.frames,
+                    "dropped": self.dropped, "failed_reads": self.failed_reads, "fps": round(self._fps, 1)}
+
+
+_camera = None
+_camera_lock = threading.Lock()
+
+
+def get_camera():
+    """The process-wide camera, started on first use"""
+    global _camera
+    with _camera_lock:
+        if _camera is None:
+            _camera = CameraService().start()
+        return _camera
+
+
+def stop_camera():
+    global _camera
+    with _camera_lock:
+        if _camera is not None:
+            _camera.stop()
+            _camera = None
@@ -0,0 +1,58 @@
+"""
+In-place camera-frame rendering for the level canvases.
+
+Levels used to build a new PIL image, a new ImageTk.PhotoImage and a new
+canvas item every frame, and never deleted the old items, so the canvas
+display list grew for as long as a level ran. CanvasRenderer creates one
+PIL image, one PhotoImage and one canvas image item on the first frame.
+After that, each frame's pixels are decoded into the PIL image with the
+BGR->RGB swap done by PIL's raw decoder in the same pass, then pasted into
+the PhotoImage. Nothing is allocated per frame, and the canvas keeps a single
+image item, placed below anything else drawn on it.
+"""
+import time
+import tkinter as tk
+
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class CanvasRenderer:
+    """One persistent image item on a Tk canvas, updated in place each frame"""
+    def __init__(self, canvas, x=0, y=0, photo_factory=ImageTk.PhotoImage):
+        self.canvas = canvas
+        self.x, self.y = x, y
+        self.photo_factory = photo_factory
+        self._image = None
+        self._photo = None
+        self._item = None
+        self.frames = 0
+        self.rebuilds = 0
+        self.render_ms = 0.0
+
+    def _rebuild(self, size):
+        self._image = Image.new("RGB", size)
+        self._photo = self.photo_factory(image=self._image)
+        if self._item is None:
+            self._item = self.canvas.create_image(self.x, self.y, anchor=tk.NW, image=self._photo)
+            self.canvas.tag_lower(self._item)
+        else:
+            self.canvas.itemconfigure(self._item, image=self._photo)
+        # Tk only holds the photo's name; keep the object alive as the old code did with canvas.imgtk
+        self.canvas.imgtk = self._photo
+        self.rebuilds += 1
+
+    def show(self, frame, bgr=True):
+        """Draw an HxWx3 uint8 frame (BGR unless bgr=False)"""
+        t0 = time.perf_counter()
+        h, w = frame.shape[:2]
+        if self._image is None or self._image.size != (w, h):
+            self._rebuild((w, h))
+        self._image.frombytes(np.ascontiguousarray(frame), "raw", "BGR" if bgr else "RGB")
+        self._photo.paste(self._image)
+        ms = (time.perf_counter() - t0) * 1000
+        self.render_ms = ms if not self.frames else 0.9 * self.render_ms + 0.1 * ms
+        self.frames += 1
+
+    def stats(self):
+        return {"frames": self.frames, "rebuilds": self.rebuilds, "render_ms": round(self.render_ms, 3)}
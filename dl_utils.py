@@ -4,7 +4,7 @@ try:
     from ultralytics import YOLO
 except Exception:
     YOLO = None
-import mediapipe as mp
+from hand_tracking import hands_pool
 
 
 class ObjectDetector:
@@ -44,14 +44,17 @@ class ObjectDetector:
 
 class HandTracker:
     def __init__(self, min_detection_confidence=0.7, min_tracking_confidence=0.5):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(static_image_mode=False,
-                                         max_num_hands=2,
-                                         min_detection_confidence=min_detection_confidence,
-                                         min_tracking_confidence=min_tracking_confidence)
+        # a pooled graph of its own: the levels' graph for the same configuration
+        # tracks their frames, and detect() runs on frames of its own
+        self.hands = hands_pool().warm(stream="dl_utils",
+                                       static_image_mode=False,
+                                       max_num_hands=2,
+                                       min_detection_confidence=min_detection_confidence,
+                                       min_tracking_confidence=min_tracking_confidence)
 
     def detect(self, frame):
         try:
+            self.hands.next_frame()
             rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             res = self.hands.process(rgb)
             return res
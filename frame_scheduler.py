@@ -0,0 +1,164 @@
+"""
+Frame pacing for the level update loops.
+
+Levels used to reschedule with root.after(10, update) however long the
+frame took, and poll every 10 ms while the camera had nothing new. A
+FrameScheduler instead keeps a target frame rate: the next update is due one
+frame period after the previous one was due, so the delay shrinks as the
+work grows. Polls for a frame that hasn't arrived yet wait until the camera's
+next frame is expected. When a frame overruns its budget the scheduler
+reports that it is behind, and the next frame reuses the previous landmarks
+instead of running inference again (FrameHands.next_frame(reuse=True)).
+
+    pacer = FrameScheduler(root, name="level1")
+    def update():
+        ok, frame = cap.read()
+        if not ok:
+            pacer.retry(update)
+            return
+        hands.next_frame(reuse=pacer.skip_inference())
+        ...
+        pacer.next(update)
+    pacer.start(update)
+"""
+import os
+import threading
+import time
+
+TARGET_FPS = float(os.environ.get("GAME_TARGET_FPS", 30))
+
+
+class FrameScheduler:
+    """Deadline-based replacement for root.after(10, update)"""
+    def __init__(self, root, target_fps=TARGET_FPS, name="", max_skip=1, min_poll_ms=2,
+                 clock=time.perf_counter):
+        """
+        root: anything with Tk's after()/after_cancel().
+        max_skip: consecutive frames that may reuse the previous landmarks
+            while behind, so tracking never stops altogether.
+        min_poll_ms: shortest wait before polling the camera again.
+        """
+        self.root = root
+        self.period = 1.0 / max(1.0, float(target_fps))
+        self.name = name
+        self.max_skip = max_skip
+        self.min_poll_ms = min_poll_ms
+        self.clock = clock
+        self._after_id = None
+        self._started = None
+        self._deadline = None
+        self._polled = False
+        self._last_frame = None
+        self._source_interval = None
+        self._behind = False
+        self._skipped_in_row = 0
+        self.frames = 0
+        self.polls = 0
+        self.late = 0
+        self.dropped = 0
+        self.skipped_inference = 0
+        self.work_ms = 0.0
+        self._fps = 0.0
+        self._t0 = None
+        _register(self)
+
+    def _schedule(self, delay_s, fn):
+        self._after_id = self.root.after(max(0, int(round(delay_s * 1000))), self._run, fn)
+
+    def _run(self, fn):
+        self._after_id = None
+        self._started = self.clock()
+        if self._t0 is None:
+            self._t0 = self._started
+        fn()
+
+    def start(self, fn):
+        """Run fn as the first frame now"""
+        self._deadline = self.clock()
+        self._run(fn)
+
+    def next(self, fn):
+        """The frame is done; run fn when the next one is due"""
+        now = self.clock()
+        work_ms = (now - self._started) * 1000
+        self.work_ms = work_ms if not self.frames else 0.9 * self.work_ms + 0.1 * work_ms
+        if self._last_frame is not None:
+            interval = self._started - self._last_frame
+            fps = 1 / max(interval, 1e-6)
+            self._fps = fps if self.frames == 1 else 0.9 * self._fps + 0.1 * fps
+            # how often the camera delivers, judged from frames that needed polling
+            if self._polled:
+                self._source_interval = interval if self._source_interval is None \
+                    else 0.8 * self._source_interval + 0.2 * interval
+        self._last_frame = self._started
+        self.frames += 1
+        # a frame that waited for the camera starts its budget when the frame arrived
+        base = self._started if self._polled or self._deadline is None else self._deadline
+        self._polled = False
+        due = base + self.period
+        if now > due:
+            self._behind = True
+            self.late += 1
+            self.dropped += int((now - due) / self.period)
+            self._deadline = now
+            self._schedule(0, fn)
+        else:
+            self._behind = False
+            self._deadline = due
+            self._schedule(due - now, fn)
+
+    def retry(self, fn):
+        """No new camera frame yet; poll again when one is expected"""
+        self.polls += 1
+        self._polled = True
+        now = self.clock()
+        wait = self.period / 4
+        if self._source_interval is not None and self._last_frame is not None:
+            wait = self._last_frame + self._source_interval - now
+            if wait <= 0:
+                wait = self.period / 8  # overdue: keep polling, but not flat out
+        self._schedule(max(self.min_poll_ms / 1000, min(wait, self.period)), fn)
+
+    def skip_inference(self):
+        """True when this frame should reuse the previous landmarks to catch up"""
+        if self._behind and self._skipped_in_row < self.max_skip:
+            self._skipped_in_row += 1
+            self.skipped_inference += 1
+            return True
+        self._skipped_in_row = 0
+        return False
+
+    @property
+    def behind(self):
+        return self._behind
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def stats(self):
+        elapsed = (self._last_frame - self._t0) if self._last_frame is not None and self._t0 is not None else 0
+        return {"name": self.name, "target_fps": round(1 / self.period, 1), "fps": round(self._fps, 1),
+                "avg_fps": round((self.frames - 1) / elapsed, 1) if elapsed > 0 else 0.0,
+                "frames": self.frames, "work_ms": round(self.work_ms, 2), "late": self.late,
+                "dropped": self.dropped, "skipped_inference": self.skipped_inference, "polls": self.polls}
+
+
+_latest = None
+_latest_lock = threading.Lock()
+
+
+def _register(scheduler):
+    global _latest
+    with _latest_lock:
+        _latest = scheduler
+
+
+def latest_scheduler():
+    """The most recently created scheduler (the running or last-played level's), or None"""
+    with _latest_lock:
+        return _latest
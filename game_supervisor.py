@@ -0,0 +1,281 @@
+"""
+Keeps at most one warm game process (main.py) per station.
+
+The first /play for a station starts the game with a stdin control pipe;
+later calls reuse it by writing "show" to that pipe instead of paying for
+another cv2/mediapipe/torch import and camera open. The game prints
+"READY <seconds>" once its menu is up, which is recorded as startup timing,
+and quits when its stdin closes, so it cannot outlive the server.
+
+Each running game also gets a pidfile naming the server process that owns
+it. Games whose owner is gone (left behind by a crash or an older server)
+are killed when a supervisor first starts one. Checking and writing a
+station's pidfile happens under an flock on "<station>.lock" in the same
+directory, so sibling pre-fork workers can't both start a game for it.
+"""
+import collections
+import contextlib
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+STATION_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+def _pid_alive(pid):
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; without psutil, assume it's gone
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _cmdline(pid):
+    """The process's command line, or None if it can't be read"""
+    try:
+        import psutil
+        return " ".join(psutil.Process(pid).cmdline())
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return None
+
+
+class GameProcess:
+    """One supervised game process and its startup timing"""
+    def __init__(self, station, proc, started_at):
+        self.station = station
+        self.proc = proc
+        self.started_at = started_at
+        self.ready_s = None
+        self.reported_ready_s = None
+        self.reuses = 0
+        self.output = collections.deque(maxlen=20)
+        self.ready = threading.Event()
+
+    @property
+    def pid(self):
+        return self.proc.pid
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def status(self):
+        if self.alive():
+            state = "ready" if self.ready.is_set() else "starting"
+        else:
+            state = "exited"
+        return {"station": self.station, "pid": self.pid, "state": state,
+                "returncode": self.proc.returncode, "uptime_s": round(time.monotonic() - self.started_at, 3),
+                "startup_s": self.ready_s, "game_reported_startup_s": self.reported_ready_s,
+                "reuses": self.reuses, "output": list(self.output)}
+
+
+class GameSupervisor:
+    def __init__(self, cmd, cwd=None, state_dir=None, stop_timeout=5.0):
+        """
+        cmd: argv that starts the game in supervised mode.
+        state_dir: where pidfiles live; shared by every server on the machine.
+        """
+        self.cmd = list(cmd)
+        self.cwd = cwd
+        self.state_dir = state_dir or os.path.join(tempfile.gettempdir(), "stroke-game")
+        self.stop_timeout = stop_timeout
+        self._games = {}
+        self._lock = threading.Lock()
+        self._orphans_checked = False
+        self.launches = 0
+        self.orphans_killed = 0
+
+    def _pidfile(self, station):
+        return os.path.join(self.state_dir, f"{station}.pid")
+
+    @contextlib.contextmanager
+    def _station_lock(self, station):
+        """Exclusive across processes sharing state_dir"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(os.path.join(self.state_dir, f"{station}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _marker(self):
+        # identifies game processes when checking pidfiles, so a reused pid is never killed
+        return os.path.basename(self.cmd[1] if len(self.cmd) > 1 else self.cmd[0])
+
+    def _read_pidfile(self, path):
+        try:
+            with open(path) as f:
+                pid, owner = (int(v) for v in f.read().split()[:2])
+            return pid, owner
+        except (OSError, ValueError):
+            return None
+
+    def _is_game(self, pid):
+        cmdline = _cmdline(pid)
+        return cmdline is not None and self._marker() in cmdline
+
+    def kill_orphans(self):
+        """Kill games whose owning server process is gone; returns the pids killed"""
+        killed = []
+        if not os.path.isdir(self.state_dir):
+            return killed
+        for name in os.listdir(self.state_dir):
+            path = os.path.join(self.state_dir, name)
+            entry = self._read_pidfile(path) if name.endswith(".pid") else None
+            if entry is None:
+                continue
+            pid, owner = entry
+            if _pid_alive(owner) and owner != os.getpid():
+                continue
+            if pid not in {g.pid for g in self._games.values()} and _pid_alive(pid) and self._is_game(pid):
+                self._terminate_pid(pid)
+                killed.append(pid)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.orphans_killed += len(killed)
+        return killed
+
+    def _terminate_pid(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + self.stop_timeout
+            while time.monotonic() < deadline and _pid_alive(pid) and self._is_game(pid):
+                time.sleep(0.05)
+            if _pid_alive(pid) and self._is_game(pid):
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass
+
+    def _watch_output(self, game):
+        # keep draining stdout so a chatty game never blocks on a full pipe
+        for line in game.proc.stdout:
+            line = line.rstrip()
+            if not game.ready.is_set() and line.startswith("READY"):
+                game.ready_s = round(time.monotonic() - game.started_at, 3)
+                parts = line.split()
+                if len(parts) > 1:
+                    try:
+                        game.reported_ready_s = float(parts[1])
+                    except ValueError:
+                        pass
+                game.ready.set()
+            else:
+                game.output.append(line)
+
+    def _send(self, game, command):
+        try:
+            game.proc.stdin.write(command + "\n")
+            game.proc.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _spawn(self, station):
+        os.makedirs(self.state_dir, exist_ok=True)
+        proc = subprocess.Popen(self.cmd, cwd=self.cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True, bufsize=1)
+        game = GameProcess(station, proc, time.monotonic())
+        threading.Thread(target=self._watch_output, args=(game,), name=f"game-{station}", daemon=True).start()
+        with open(self._pidfile(station), "w") as f:
+            f.write(f"{proc.pid} {os.getpid()}\n")
+        self.launches += 1
+        return game
+
+    def launch(self, station="default"):
+        """Start the station's game, or bring the running one to the front.
+        Returns (status, action) where action is "started", "reused" or "running_elsewhere"."""
+        if not STATION_RE.match(station):
+            raise ValueError(f"invalid station id: {station!r}")
+        with self._lock:
+            if not self._orphans_checked:
+                self._orphans_checked = True
+                self.kill_orphans()
+            game = self._games.get(station)
+            if game is not None and game.alive() and self._send(game, "show"):
+                game.reuses += 1
+                return game.status(), "reused"
+            if game is not None:
+                self._reap(station)
+            with self._station_lock(station):
+                # another server process (e.g. a sibling pre-fork worker) may own this station's game
+                entry = self._read_pidfile(self._pidfile(station))
+                if entry and entry[1] != os.getpid() and _pid_alive(entry[1]) and _pid_alive(entry[0]) \
+                        and self._is_game(entry[0]):
+                    return {"station": station, "pid": entry[0], "state": "running", "owner": entry[1]}, \
+                        "running_elsewhere"
+                game = self._games[station] = self._spawn(station)
+            return game.status(), "started"
+
+    def _reap(self, station):
+        game = self._games.pop(station, None)
+        if game is None:
+            return
+        if game.alive():
+            self._send(game, "quit")
+            try:
+                game.proc.wait(self.stop_timeout)
+            except subprocess.TimeoutExpired:
+                game.proc.kill()
+                game.proc.wait()
+        entry = self._read_pidfile(self._pidfile(station))
+        if entry and entry[0] == game.pid:
+            try:
+                os.remove(self._pidfile(station))
+            except OSError:
+                pass
+
+    def status(self):
+        """Per-station status. A game that exited on its own is reported once as
+        "exited", then reaped: its entry and pidfile are removed."""
+        with self._lock:
+            games = {}
+            for s, g in list(self._games.items()):
+                games[s] = g.status()
+                if games[s]["state"] == "exited":
+                    self._reap(s)
+        return {"games": games, "launches": self.launches, "orphans_killed": self.orphans_killed}
+
+    def stop(self, station=None):
+        """Stop one station's game, or all of them"""
+        with self._lock:
+            for s in ([station] if station else list(self._games)):
+                self._reap(s)
+
+
+def game_command(script="main.py"):
+    return [sys.executable or "python", script, "--supervised"]
@@ -0,0 +1,326 @@
+"""
+Hand-tracking helpers shared by the levels.
+FrameHands wraps a MediaPipe Hands detector so landmark inference runs at
+most once per captured frame, however many places (game logic, metrics,
+drawing) ask for the result. HandsPool keeps one detector graph per
+configuration for the whole process, so switching levels resets a graph
+instead of building (and leaking) a new one.
+
+With HAND_TRACKING_PROCESS=1, hands_pool() hands out detectors that run in
+a separate worker process instead (see tracking_worker.py). With
+HAND_TRACKING_ROI=1, detectors look at a crop around the previous frame's
+hands instead of the whole frame (RoiHands, experimental).
+"""
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+HAND_TRACKING_PROCESS = os.environ.get("HAND_TRACKING_PROCESS", "0") == "1"
+HAND_TRACKING_ROI = os.environ.get("HAND_TRACKING_ROI", "0") == "1"
+
+
+class FrameHands:
+    """Per-frame landmark cache around a MediaPipe Hands instance.
+
+    Call next_frame() when a new camera frame arrives. The first process()
+    or process_bgr() call for that frame runs MediaPipe; later calls return
+    the same results. next_frame(reuse=True) keeps the previous frame's
+    results instead, for a frame that has to skip inference to catch up.
+    Anything else (e.g. close()) goes to the wrapped detector, so it can be
+    passed wherever a Hands object was expected.
+    """
+    def __init__(self, hands):
+        self.hands = hands
+        self._results = None
+        self._last = None
+        self.frames = 0
+        self.inferences = 0
+        self.reused = 0
+        self.skipped = 0
+
+    def next_frame(self, reuse=False):
+        if reuse and self._last is not None:
+            self._results = self._last
+            self.skipped += 1
+        else:
+            self._results = None
+        self.frames += 1
+
+    def process(self, rgb):
+        """Landmarks for the current frame; rgb is only used on the first call"""
+        if self._results is None:
+            self._results = self._last = self.hands.process(rgb)
+            self.inferences += 1
+        else:
+            self.reused += 1
+        return self._results
+
+    def process_bgr(self, img):
+        """Like process(), but only pays for the BGR->RGB conversion when inference runs"""
+        if self._results is not None:
+            self.reused += 1
+            return self._results
+        return self.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
+    @property
+    def results(self):
+        """This frame's results, or None if nothing has asked for them yet"""
+        return self._results
+
+    def __getattr__(self, name):
+        return getattr(self.hands, name)
+
+
+# mp.solutions.hands.Hands defaults, so equivalent configurations share a graph
+HANDS_DEFAULTS = {"static_image_mode": False, "max_num_hands": 2, "model_complexity": 1,
+                  "min_detection_confidence": 0.5, "min_tracking_confidence": 0.5}
+
+
+def _mediapipe_hands(**config):
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(**config)
+
+
+class RoiHands:
+    """Hands detector that looks at a padded crop around the previous frame's hands.
+
+    Experimental, and off unless HAND_TRACKING_ROI=1. Nothing yet shows it
+    beating full-frame video-mode tracking on real footage: MediaPipe's palm
+    and landmark models take fixed-size inputs, so per-call cost barely
+    depends on input size (about 15 ms for a 640x480 frame or a 192x192 crop
+    with no hand in view), and in video mode the graph already skips palm
+    detection while it tracks a hand. See benchmarks/bench_roi.py.
+
+    Landmarks found in the crop are rewritten in place to full-frame
+    normalised coordinates, so callers read them exactly as before. The
+    whole frame is used when nothing was tracked on the previous frame, when
+    the crop loses the hand (retried on the same frame), and every
+    refresh_every frames so a hand entering elsewhere is still picked up.
+
+    Full frames and crops go to separate video-mode graphs, since a graph
+    tracks the hand region in normalised coordinates of its previous input.
+    The crop keeps its position and size while the hands stay clear of its
+    border, so the crop graph sees a fixed frame of reference. It is only
+    moved when they get within edge of the border, which costs the crop
+    graph one re-detection (counted as recenters). The graph is not reset
+    for that, because Hands.reset() costs more than the re-detection.
+    """
+    def __init__(self, hands, crop_hands, pad=0.5, min_size=128, refresh_every=15, max_area=0.6, edge=0.15):
+        """
+        hands: the full-frame detector; crop_hands: a second detector for the crops.
+        pad: margin added on each side, as a fraction of the hands' bounding box.
+        min_size: smallest crop side in pixels.
+        max_area: crops covering more of the frame than this just use the frame.
+        edge: the crop moves when the hands come this close to its border,
+            as a fraction of its side.
+        """
+        self.hands = hands
+        self.crop_hands = crop_hands
+        self.pad = pad
+        self.min_size = min_size
+        self.refresh_every = refresh_every
+        self.max_area = max_area
+        self.edge = edge
+        self._roi = None
+        self._since_full = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+        self.recenters = 0
+
+    def forget(self):
+        """Drop the tracked region, e.g. when a new level starts"""
+        self._roi = None
+
+    def reset(self):
+        self.forget()
+        for hands in (self.hands, self.crop_hands):
+            reset = getattr(hands, "reset", None)
+            if reset is not None:
+                reset()
+
+    def close(self):
+        self.hands.close()
+        self.crop_hands.close()
+
+    @staticmethod
+    def _points(results, w, h):
+        return [(p.x * w, p.y * h) for hand in results.multi_hand_landmarks for p in hand.landmark]
+
+    def _roi_from(self, points, w, h):
+        xs, ys = [x for x, _ in points], [y for _, y in points]
+        side = max(max(xs) - min(xs), max(ys) - min(ys)) * (1 + 2 * self.pad)
+        side = int(min(max(side, self.min_size), w, h))
+        if side * side >= self.max_area * w * h:
+            return None
+        cx, cy = (max(xs) + min(xs)) / 2, (max(ys) + min(ys)) / 2
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def _fits(self, points):
+        x0, y0, x1, y1 = self._roi
+        m = self.edge * (x1 - x0)
+        return all(x0 + m <= x <= x1 - m and y0 + m <= y <= y1 - m for x, y in points)
+
+    def _track(self, results, w, h):
+        """Keep the crop where it is while the hands fit in it, else move it around them"""
+        if not getattr(results, "multi_hand_landmarks", None):
+            self._roi = None
+            return
+        points = self._points(results, w, h)
+        if self._roi is not None and self._fits(points):
+            return
+        roi = self._roi_from(points, w, h)
+        if self._roi is not None and roi is not None:
+            self.recenters += 1
+        self._roi = roi
+
+    @staticmethod
+    def _to_frame(results, roi, w, h):
+        x0, y0, x1, y1 = roi
+        sx, sy = (x1 - x0) / w, (y1 - y0) / h
+        for hand in results.multi_hand_landmarks:
+            for p in hand.landmark:
+                p.x = x0 / w + p.x * sx
+                p.y = y0 / h + p.y * sy
+                p.z *= sx  # z uses the same scale as x
+
+    def process(self, rgb):
+        h, w = rgb.shape[:2]
+        if self._roi is not None and self._since_full < self.refresh_every:
+            x0, y0, x1, y1 = self._roi
+            results = self.crop_hands.process(np.ascontiguousarray(rgb[y0:y1, x0:x1]))
+            if getattr(results, "multi_hand_landmarks", None):
+                self._to_frame(results, self._roi, w, h)
+                self._track(results, w, h)
+                self._since_full += 1
+                self.roi_frames += 1
+                return results
+            self.fallbacks += 1
+        results = self.hands.process(rgb)
+        self.full_frames += 1
+        self._since_full = 0
+        self._track(results, w, h)
+        return results
+
+    def stats(self):
+        return {"roi_frames": self.roi_frames, "full_frames": self.full_frames, "fallbacks": self.fallbacks,
+                "recenters": self.recenters}
+
+    def __getattr__(self, name):
+        return getattr(self.hands, name)
+
+
+class PooledHands(FrameHands):
+    """A pool-owned detector; close() hands it back instead of destroying the graph"""
+    def __init__(self, hands):
+        super().__init__(hands)
+        # True until the first level uses it, so a freshly built graph isn't reset
+        self.fresh = True
+
+    def close(self):
+        self.next_frame()
+
+    def _close_graph(self):
+        self.hands.close()
+
+
+class HandsPool:
+    """Process-wide MediaPipe Hands graphs keyed by configuration"""
+    def __init__(self, factory=_mediapipe_hands, restart_graphs=False, roi=HAND_TRACKING_ROI):
+        """
+        restart_graphs: also restart the MediaPipe graph (Hands.reset()) when a
+            level acquires it. That drops the previous level's tracking state
+            but re-opens every calculator, which costs about as much as
+            building a new graph on the next frame. Without it, a stale hand
+            region is simply re-detected on the first frame.
+        roi: wrap each graph in RoiHands, with a second graph for the crops.
+        """
+        self.factory = factory
+        self.restart_graphs = restart_graphs
+        self.roi = roi
+        self._graphs = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reuses = 0
+        self.resets = 0
+        self.build_s = {}
+
+    def _get(self, config, stream=None):
+        full = dict(HANDS_DEFAULTS, **config)
+        key = (stream, tuple(sorted(full.items())))
+        hands = self._graphs.get(key)
+        if hands is None:
+            t0 = time.perf_counter()
+            detector = self.factory(**full)
+            if self.roi:
+                detector = RoiHands(detector, self.factory(**full))
+            hands = self._graphs[key] = PooledHands(detector)
+            self.build_s[key] = round(time.perf_counter() - t0, 4)
+            self.created += 1
+        return hands
+
+    def warm(self, stream=None, **config):
+        """Build the graph for config ahead of time (e.g. at game startup) and
+        return it without resetting it.
+        stream: a name for callers that feed the graph frames of their own,
+            alongside the running level; each stream gets separate graphs."""
+        with self._lock:
+            return self._get(config, stream)
+
+    def acquire(self, stream=None, **config):
+        """The shared detector for config (Hands keyword arguments), with its
+        per-frame cache cleared for the new level"""
+        with self._lock:
+            hands = self._get(config, stream)
+            if not hands.fresh:
+                reset = getattr(hands.hands, "reset", None)
+                if self.restart_graphs and reset is not None:
+                    reset()
+                    self.resets += 1
+                self.reuses += 1
+            forget = getattr(hands.hands, "forget", None)
+            if forget is not None:
+                forget()
+            hands.fresh = False
+            hands._last = None  # nothing from the previous level is reused
+            hands.next_frame()
+            return hands
+
+    def close(self):
+        with self._lock:
+            for hands in self._graphs.values():
+                hands._close_graph()
+            self._graphs.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = {"graphs": len(self._graphs), "created": self.created, "reuses": self.reuses,
+                     "resets": self.resets,
+                     "build_s": list(self.build_s.values())}
+            if self.roi:
+                roi = [h.hands.stats() for h in self._graphs.values()]
+                stats["roi"] = {k: sum(r[k] for r in roi)
+                                for k in ("roi_frames", "full_frames", "fallbacks", "recenters")}
+            return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hands_pool():
+    """The process-wide HandsPool, or a RemoteHandsPool with HAND_TRACKING_PROCESS=1"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if HAND_TRACKING_PROCESS:
+                from tracking_worker import RemoteHandsPool
+                _pool = RemoteHandsPool()
+            else:
+                _pool = HandsPool()
+        return _pool
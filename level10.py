@@ -1,10 +1,12 @@
 import cv2
-import mediapipe as mp
 import tkinter as tk
-from PIL import Image, ImageTk
 import time
 import random
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 try:
     from dl_utils import DLModelManager
     from movement_metrics import MovementMetrics
@@ -21,12 +23,13 @@ def run_level10(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
     label = tk.Label(root, text="Follow the sequence of zones in order (Mixed Sequence)", font=("Arial", 14))
     label.pack()
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level10")
 
     # Create zone positions
     zone_positions = [(120, 120), (320, 120), (520, 120), (320, 360)]  # TL, TC, TR, BC
@@ -54,9 +57,10 @@ def run_level10(root, level_unlocked, back_to_menu_callback, new_level_callback,
         nonlocal index, hits
         ret, frame = cap.read()
         if not ret:
-            root.after(10, update)
+            pacer.retry(update)
             return
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         init_dl()
         h, w, _ = frame.shape
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -104,13 +108,9 @@ def run_level10(root, level_unlocked, back_to_menu_callback, new_level_callback,
                 index = min(len(sequence) - 1, index + 1)
                 cv2.putText(frame, '✓ ZONE HIT!', (250, 150), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if hits >= hits_required:
-            cap.release()
             hands.close()
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -121,6 +121,6 @@ def run_level10(root, level_unlocked, back_to_menu_callback, new_level_callback,
             level_unlocked[10] = True
             show_result(root, score, level_unlocked, back_to_menu_callback, new_level_callback, retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
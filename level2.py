@@ -2,10 +2,13 @@ import cv2
 import numpy as np
 import mediapipe as mp
 import tkinter as tk
-from PIL import Image, ImageTk
 from level3 import show_result
 import os
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 
 # Optional DL integration
 try:
@@ -57,12 +60,13 @@ def run_level2(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
 
-    cap = cv2.VideoCapture(0)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level2")
 
     # -------- Initialize MediaPipe Hands --------
-    mp_hands = mp.solutions.hands
-    hands_module = mp_hands.Hands(
+    hands_module = hands_pool().acquire(
         static_image_mode=False,
         max_num_hands=1,
         min_detection_confidence=0.7,
@@ -109,10 +113,11 @@ def run_level2(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
         ret, frame = cap.read()
         if not ret:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands_module.next_frame(reuse=pacer.skip_inference())
         h, w, _ = frame.shape
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
@@ -196,7 +201,6 @@ def run_level2(root, level_unlocked, back_to_menu_callback, new_level_callback,
             cv2.putText(frame, "Level 2 Completed!", (150, 460), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
             if not result_shown:
                 result_shown = True
-                cap.release()
                 hands_module.close()
                 # Log session
                 try:
@@ -216,11 +220,8 @@ def run_level2(root, level_unlocked, back_to_menu_callback, new_level_callback,
         # -------- Draw score --------
         cv2.putText(frame, f"Score: {score}", (450, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
-        root.after(10, update)
+        pacer.next(update)
 
-    update()
+    pacer.start(update)
@@ -1,9 +1,11 @@
 import cv2
 import numpy as np
 import tkinter as tk
-from PIL import Image, ImageTk
-import mediapipe as mp
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 try:
     from dl_utils import DLModelManager
     from movement_metrics import MovementMetrics
@@ -96,10 +98,11 @@ def run_level3(root, level_unlocked, back_to_menu_callback, new_level_callback,r
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level3")
 
     game = Level3_ColorMatching(hands)
     # Lazy init DL modules
@@ -116,26 +119,23 @@ def run_level3(root, level_unlocked, back_to_menu_callback, new_level_callback,r
     def update():
         success, frame = cap.read()
         if not success:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         frame = game.update(frame)
         game.draw(frame)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if game.is_level_complete():
             level_unlocked[4] = True
-            cap.release()
             show_result(root, 100.0, level_unlocked, back_to_menu_callback, new_level_callback,retry_level_callback)
         else:
-            root.after(10, update)  
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
 
 
 def show_result(root, acc, level_unlocked, back_to_menu_callback, new_level_callback,retry_level_callback):
@@ -1,9 +1,11 @@
 import cv2
 import random
 import tkinter as tk
-from PIL import Image, ImageTk
-import mediapipe as mp
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 
 from level3 import show_result
 import time
@@ -82,13 +84,6 @@ class Level4_SequenceTapping:
                     self.current_show_index = -1
         else:
             results = self.hands_detector.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-            index_pos = None
-            if results.multi_hand_landmarks:
-                lm = results.multi_hand_landmarks[0]
-                h, w, _ = img.shape
-                index_pos = (int(lm.landmark[8].x * w), int(lm.landmark[8].y * h))
-                cv2.circle(img, index_pos, 10, (255, 255, 255), -1)
-
             if results.multi_hand_landmarks:
                 lm = results.multi_hand_landmarks[0]
                 h, w, _ = img.shape
@@ -145,20 +140,23 @@ def run_level4(root, level_unlocked, back_to_menu_callback, new_level_callback,r
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    # shared graph, reset for this level; game logic and metrics share one run per frame
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level4")
 
     game = Level4_SequenceTapping(hands)
 
     def update():
         success, frame = cap.read()
         if not success:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         # Lazy init DL modules
         if DL_AVAILABLE and 'model_manager' not in globals():
             try:
@@ -175,7 +173,7 @@ def run_level4(root, level_unlocked, back_to_menu_callback, new_level_callback,r
         # Collect simple position metric from hand index if available
         if DL_AVAILABLE and globals().get('metrics') is not None:
             try:
-                res = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                res = hands.process_bgr(frame)
                 if res.multi_hand_landmarks:
                     lm = res.multi_hand_landmarks[0]
                     h, w, _ = frame.shape
@@ -186,15 +184,11 @@ def run_level4(root, level_unlocked, back_to_menu_callback, new_level_callback,r
                 pass
         game.draw(frame)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if game.is_level_complete():
             level_unlocked[5] = True
             accuracy = game.get_accuracy()
-            cap.release()
             # Log session if logger available
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -203,6 +197,6 @@ def run_level4(root, level_unlocked, back_to_menu_callback, new_level_callback,r
                 pass
             show_result(root, accuracy, level_unlocked, back_to_menu_callback, new_level_callback,retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
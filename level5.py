@@ -1,10 +1,12 @@
 import tkinter as tk
-from PIL import Image, ImageTk
 import cv2
-import mediapipe as mp
 import numpy as np
 from level3 import show_result
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 class GripStrengthGame:
     def __init__(self):
         self.font = cv2.FONT_HERSHEY_SIMPLEX
@@ -78,32 +80,30 @@ def run_game(root, GameClass, level_unlocked, back_to_menu_callback, new_level_c
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level5")
     game = GameClass()
 
     def update():
         ret, frame = cap.read()
         if not ret:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         frame = game.update(frame, hands)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
         accuracy=5
         if game.is_level_complete():
             level_unlocked[6] = True
-            cap.release()
             hands.close()
             show_result(root, 100.0, level_unlocked, back_to_menu_callback, new_level_callback,retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
\ No newline at end of file
+    pacer.start(update)
\ No newline at end of file
@@ -1,11 +1,13 @@
 import cv2
 import numpy as np
 import tkinter as tk
-from PIL import Image, ImageTk
-import mediapipe as mp
 import time
 from level3 import show_result
 from smoothing_utils import DistanceSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 try:
     from dl_utils import DLModelManager
     from movement_metrics import MovementMetrics
@@ -76,20 +78,23 @@ def run_level6(root, level_unlocked, back_to_menu_callback, new_level_callback,r
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    # shared graph, reset for this level; game logic and metrics share one run per frame
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level6")
 
     game = Level6_HandOpenClose(hands)
 
     def update():
         success, frame = cap.read()
         if not success:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         # Lazy init DL modules
         if DL_AVAILABLE and 'model_manager' not in globals():
             try:
@@ -106,7 +111,7 @@ def run_level6(root, level_unlocked, back_to_menu_callback, new_level_callback,r
         # Collect index position for metrics
         if DL_AVAILABLE and globals().get('metrics') is not None:
             try:
-                res = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                res = hands.process_bgr(frame)
                 if res.multi_hand_landmarks:
                     lm = res.multi_hand_landmarks[0]
                     h, w, _ = frame.shape
@@ -116,13 +121,9 @@ def run_level6(root, level_unlocked, back_to_menu_callback, new_level_callback,r
             except Exception:
                 pass
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if game.is_level_complete():
-            cap.release()
             hands.close()
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -131,6 +132,6 @@ def run_level6(root, level_unlocked, back_to_menu_callback, new_level_callback,r
                 pass
             show_result(root, 100.0, level_unlocked, back_to_menu_callback, new_level_callback,retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
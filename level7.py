@@ -1,13 +1,15 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import math
 import tkinter as tk
-from PIL import Image, ImageTk
 import random
 import time
 from level3 import show_result
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 # Optional DL integration
 try:
     from dl_utils import DLModelManager
@@ -24,12 +26,13 @@ def run_level7(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
     label_stats = tk.Label(root, text="", font=("Arial", 14))
     label_stats.pack()
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level7")
 
     prev_x, prev_y = 0, 0
     ball_pos = [300, 300]
@@ -58,10 +61,11 @@ def run_level7(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
         success, frame = cap.read()
         if not success:
-            root.after(10, update)
+            pacer.retry(update)
             return
 
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = hands.process(rgb)
         h, w, _ = frame.shape
@@ -114,13 +118,9 @@ def run_level7(root, level_unlocked, back_to_menu_callback, new_level_callback,
         stats_text = f"Placed: {placed_balls}/{placements_required}"
         label_stats.config(text=stats_text)
 
-        img = Image.fromarray(frame)
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if placed_balls >= placements_required:
-            cap.release()
             hands.close()
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -130,6 +130,6 @@ def run_level7(root, level_unlocked, back_to_menu_callback, new_level_callback,
             level_unlocked[8] = True
             show_result(root, 100.0, level_unlocked, back_to_menu_callback, new_level_callback, retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
\ No newline at end of file
+    pacer.start(update)
\ No newline at end of file
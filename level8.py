@@ -1,10 +1,12 @@
 import cv2
-import mediapipe as mp
 import tkinter as tk
-from PIL import Image, ImageTk
 import random
 import time
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 # Optional DL integration
 try:
     from dl_utils import DLModelManager
@@ -22,12 +24,13 @@ def run_level8(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
     label = tk.Label(root, text="Touch the targets that appear", font=("Arial", 14))
     label.pack()
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level8")
 
     targets_required = 8
     targets_hit = 0
@@ -50,9 +53,10 @@ def run_level8(root, level_unlocked, back_to_menu_callback, new_level_callback,
         nonlocal targets_hit, target, last_change
         ret, frame = cap.read()
         if not ret:
-            root.after(10, update)
+            pacer.retry(update)
             return
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         init_dl()
         h, w, _ = frame.shape
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -77,13 +81,9 @@ def run_level8(root, level_unlocked, back_to_menu_callback, new_level_callback,
         cv2.circle(frame, target, target_radius, (0, 0, 255), -1)
         cv2.putText(frame, f'{targets_hit}/{targets_required}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if targets_hit >= targets_required:
-            cap.release()
             hands.close()
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -94,6 +94,6 @@ def run_level8(root, level_unlocked, back_to_menu_callback, new_level_callback,
             level_unlocked[8] = True
             show_result(root, score, level_unlocked, back_to_menu_callback, new_level_callback, retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
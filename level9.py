@@ -1,11 +1,13 @@
 import cv2
-import mediapipe as mp
 import tkinter as tk
-from PIL import Image, ImageTk
 import time
 import random
 import numpy as np
 from smoothing_utils import ExponentialSmoother
+from camera_service import get_camera
+from hand_tracking import hands_pool
+from frame_scheduler import FrameScheduler
+from canvas_renderer import CanvasRenderer
 # Optional DL integration
 try:
     from dl_utils import DLModelManager
@@ -23,12 +25,13 @@ def run_level9(root, level_unlocked, back_to_menu_callback, new_level_callback,
 
     canvas = tk.Canvas(root, width=640, height=480)
     canvas.pack()
+    renderer = CanvasRenderer(canvas)
     label = tk.Label(root, text="Place your hand in the correct zone when prompted\n(Make a FIST in the RIGHT zone to confirm)", font=("Arial", 12))
     label.pack()
 
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-    cap = cv2.VideoCapture(0)
+    hands = hands_pool().acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = get_camera()
+    pacer = FrameScheduler(root, name="level9")
 
     zones = {'left': (120, 240), 'right': (520, 240)}
     # Randomize sequence of left/right
@@ -67,9 +70,10 @@ def run_level9(root, level_unlocked, back_to_menu_callback, new_level_callback,
         nonlocal current_index, correct, last_fist_time
         ret, frame = cap.read()
         if not ret:
-            root.after(10, update)
+            pacer.retry(update)
             return
         frame = cv2.flip(frame, 1)
+        hands.next_frame(reuse=pacer.skip_inference())
         init_dl()
         h, w, _ = frame.shape
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -122,13 +126,9 @@ def run_level9(root, level_unlocked, back_to_menu_callback, new_level_callback,
                     current_index += 1
                     cv2.putText(frame, '✓ CORRECT!', (200, 250), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
-        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        imgtk = ImageTk.PhotoImage(image=img)
-        canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-        canvas.imgtk = imgtk
+        renderer.show(frame)
 
         if correct >= attempts:
-            cap.release()
             hands.close()
             try:
                 smooth = globals()['metrics'].smoothness() if globals().get('metrics') is not None else 0.0
@@ -139,6 +139,6 @@ def run_level9(root, level_unlocked, back_to_menu_callback, new_level_callback,
             level_unlocked[9] = True
             show_result(root, score, level_unlocked, back_to_menu_callback, new_level_callback, retry_level_callback)
         else:
-            root.after(10, update)
+            pacer.next(update)
 
-    update()
+    pacer.start(update)
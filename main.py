@@ -1,4 +1,10 @@
+import time
+_START = time.perf_counter()  # first statement, so startup timing includes the level imports
 
+import os
+import queue
+import sys
+import threading
 import tkinter as tk
 from level1 import run_level1
 from level2 import run_level2
@@ -10,11 +16,20 @@ from level7 import run_level7
 from level8 import run_level8
 from level9 import run_level9
 from level10 import run_level10
+from camera_service import get_camera, stop_camera
+from hand_tracking import hands_pool
+from frame_scheduler import latest_scheduler
 
 root = tk.Tk()
 root.title("Stroke Recovery Game")
 root.geometry("640x480")
 
+# the MediaPipe Hands configurations the levels use (level 2 tracks a single hand)
+HANDS_CONFIGS = [
+    dict(min_detection_confidence=0.7, min_tracking_confidence=0.5),
+    dict(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5),
+]
+
 level_unlocked = {1: True, 2: False, 3: False, 4: False, 5: False, 6: False, 7: False, 8: False, 9: False, 10: False}
 level_accuracy = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0, 10: 0}
 
@@ -22,63 +37,63 @@ def run_level1_wrapper():
     intro = "Level 1 — Pinch and hold the target position for a few seconds."
     def start():
         run_level1(root, level_unlocked, show_main_menu, run_level2_wrapper, run_level1_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=1)
 
 def run_level2_wrapper():
     intro = "Level 2 — Drag the shapes to match the outlines on the right."
     def start():
         run_level2(root, level_unlocked, show_main_menu, run_level3_wrapper, run_level2_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=2)
 
 def run_level3_wrapper():
     print("Running Level 3")
     intro = "Level 3 — Drag colored balls into their matching baskets."
     def start():
         run_level3(root, level_unlocked, show_main_menu, run_level4_wrapper, run_level3_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=3)
 
 def run_level4_wrapper():
     print("Running Level 4")
     intro = "Level 4 — Repeat the color/tap sequence shown on the screen."
     def start():
         run_level4(root, level_unlocked, show_main_menu, run_level5_wrapper, run_level4_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=4)
 
 def run_level5_wrapper():
     intro = "Level 5 — Perform grip/close repetitions (measure strength/consistency)."
     def start():
         run_game(root, GripStrengthGame, level_unlocked, show_main_menu, run_level6_wrapper, run_level5_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=5)
 
 def run_level6_wrapper():
     intro = "Level 6 — Open/close your hand following the prompts."
     def start():
         run_level6(root, level_unlocked, show_main_menu, run_level7_wrapper, run_level6_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=6)
 
 def run_level7_wrapper():
     intro = "Level 7 — Grab the green ball with index+thumb and place it on the red circle."
     def start():
         run_level7(root, level_unlocked, show_main_menu, run_level8_wrapper, run_level7_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=7)
 
 def run_level8_wrapper():
     intro = "Level 8 — Touch the targets that appear on the screen."
     def start():
         run_level8(root, level_unlocked, show_main_menu, run_level9_wrapper, run_level8_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=8)
 
 def run_level9_wrapper():
     intro = "Level 9 — Place your hand in the correct zone when prompted."
     def start():
         run_level9(root, level_unlocked, show_main_menu, run_level10_wrapper, run_level9_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=9)
 
 def run_level10_wrapper():
     intro = "Level 10 — Follow the sequence of zones in order."
     def start():
         run_level10(root, level_unlocked, show_main_menu, run_level1_wrapper, run_level10_wrapper)
-    show_level_intro(intro, start)
+    show_level_intro(intro, start, level=10)
 
 def show_main_menu():
     for widget in root.winfo_children():
@@ -129,12 +144,42 @@ def show_how_to_play():
     ), font=("Arial", 14), wraplength=600, justify="left").pack(pady=10)
     tk.Button(root, text="Back", font=("Arial", 14), command=show_main_menu).pack(pady=20)
 
-def show_level_intro(text, start_fn, delay_ms=1400):
+def show_level_intro(text, start_fn, delay_ms=1400, level=None):
     for widget in root.winfo_children():
         widget.destroy()
     tk.Label(root, text=text, font=("Arial", 16), wraplength=600, justify="center").pack(pady=40)
     tk.Label(root, text="Starting...", font=("Arial", 12)).pack(pady=10)
-    root.after(delay_ms, lambda: start_fn())
+    root.after(delay_ms, lambda: start_level(level, start_fn))
+
+def rss_mb():
+    """Resident memory of this process in MB, MediaPipe's native allocations included"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+def start_level(level, start_fn):
+    """Run a level's setup and report how long the switch took and what it did to memory"""
+    report_pacing()
+    before = rss_mb()
+    t0 = time.perf_counter()
+    start_fn()
+    switch_ms = (time.perf_counter() - t0) * 1000
+    print(f"level {level} switch {switch_ms:.1f} ms, rss {before:.1f} -> {rss_mb():.1f} MB, "
+          f"hands {hands_pool().stats()}", flush=True)
+
+def report_pacing():
+    """Stop the previous level's update loop if it is still scheduled and print how it kept up"""
+    pacer = latest_scheduler()
+    if pacer is not None and pacer.frames:
+        pacer.stop()
+        print(f"{pacer.name} pacing {pacer.stats()}", flush=True)
 
 def show_about():
     for widget in root.winfo_children():
@@ -147,5 +192,53 @@ def show_about():
     ), font=("Arial", 14), wraplength=600, justify="left").pack(pady=10)
     tk.Button(root, text="Back", font=("Arial", 14), command=show_main_menu).pack(pady=20)
 
+def start_control_channel():
+    """
+    Supervised mode (--supervised, used by app.py's game supervisor): read
+    commands from stdin so the server can reuse this window instead of
+    starting another game. "show" raises the window, "quit" or EOF (the
+    server went away) closes the game.
+    """
+    commands = queue.Queue()
+
+    def read_stdin():
+        for line in sys.stdin:
+            commands.put(line.strip())
+        commands.put("quit")
+
+    def poll():
+        # Tk must only be touched from the main thread, so the reader thread hands off via the queue
+        while True:
+            try:
+                cmd = commands.get_nowait()
+            except queue.Empty:
+                break
+            if cmd == "show":
+                root.deiconify()
+                root.lift()
+                root.attributes("-topmost", True)
+                root.after(200, lambda: root.attributes("-topmost", False))
+                root.focus_force()
+            elif cmd == "quit":
+                root.destroy()
+                return
+        root.after(100, poll)
+
+    threading.Thread(target=read_stdin, name="control-channel", daemon=True).start()
+    poll()
+
+
+if "--supervised" in sys.argv:
+    start_control_channel()
+    root.after(0, lambda: print(f"READY {time.perf_counter() - _START:.3f}", flush=True))
+
+# open the camera and build the hand-tracking graphs now so the first level
+# doesn't wait for them; every level shares them
+get_camera()
+for config in HANDS_CONFIGS:
+    hands_pool().warm(**config)
 show_main_menu()
 root.mainloop()
+report_pacing()
+stop_camera()
+hands_pool().close()
@@ -0,0 +1,97 @@
+"""
+ONNX Runtime backend for the stroke classifier cascade.
+
+Exports the stage1/stage2 checkpoints to ONNX and wraps ONNX Runtime
+sessions so they can stand in for the torch modules in run_cascade.
+app.py uses them when PREDICT_BACKEND=onnx.
+
+    python onnx_backend.py --out-dir .
+"""
+import argparse
+import os
+import sys
+import threading
+
+import torch
+
+from stroke_models import load_classifier
+
+
+def export_onnx(model, path, opset=17):
+    """Export an eval-mode classifier with a dynamic batch dimension"""
+    example = torch.zeros(1, 1, 224, 224)
+    kwargs = dict(input_names=["input"], output_names=["logits"],
+                  dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}}, opset_version=opset)
+    try:
+        # the TorchScript-based exporter; newer torch defaults to the dynamo one
+        torch.onnx.export(model.eval(), (example,), path, dynamo=False, **kwargs)
+    except TypeError:
+        torch.onnx.export(model.eval(), (example,), path, **kwargs)
+    return path
+
+
+class OnnxClassifier:
+    """Callable like a torch classifier: (N, 1, 224, 224) tensor in, logits tensor out.
+
+    The ONNX Runtime session is created on first use in each process. A
+    pre-fork parent therefore never hands its session (whose thread pools
+    don't survive fork) to the workers, and each worker sizes its own.
+    """
+    def __init__(self, path, threads=None, share=1):
+        """
+        threads: intra-op threads. The default is torch.get_num_threads() // share
+            when the session is created, i.e. a serve.py worker's share of the
+            cores; share=2 when two stages run at once.
+        """
+        self.path = path
+        self.threads = threads
+        self.share = max(1, int(share))
+        self.input_name = None
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _create(self):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = self.threads or max(1, torch.get_num_threads() // self.share)
+        session = ort.InferenceSession(self.path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self.input_name = session.get_inputs()[0].name
+        return session
+
+    @property
+    def session(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._session = self._create()
+                    self._pid = os.getpid()
+        return self._session
+
+    def __call__(self, x):
+        arr = x.detach().cpu().numpy() if isinstance(x, torch.Tensor) else x
+        session = self.session
+        out = session.run(None, {self.input_name: arr})[0]
+        return torch.from_numpy(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the stroke classifiers to ONNX")
+    parser.add_argument("--stage1", default="best_stage1_model.pth")
+    parser.add_argument("--stage2", default="best_stage2_model.pth")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for src in (args.stage1, args.stage2):
+        out = os.path.join(args.out_dir, os.path.splitext(os.path.basename(src))[0] + ".onnx")
+        export_onnx(load_classifier(src, mmap=False), out, opset=args.opset)
+        print(f"{src} -> {out} ({os.path.getsize(out) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
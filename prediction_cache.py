@@ -0,0 +1,125 @@
+"""
+Content-addressed cache for stroke predictions.
+Entries are keyed by a hash of the decoded pixels plus the model weights
+version, evicted least-recently-used first, and optionally expire after a TTL.
+SingleFlight shares one in-flight computation between concurrent requests
+for the same key, with or without the cache.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def content_key(img, version=""):
+    """Hash a decoded PIL image's mode, size and pixels together with the weights version"""
+    h = hashlib.sha256()
+    h.update(f"{version}|{img.mode}|{img.size[0]}x{img.size[1]}|".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss counters"""
+    def __init__(self, max_entries=1024, ttl=None, clock=time.monotonic):
+        """
+        max_entries: entries kept before the least recently used is evicted.
+        ttl: seconds an entry stays valid, or None to keep entries until evicted.
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = ttl if ttl else None
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                    del self._data[key]
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (value, self._clock())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class SingleFlight:
+    """Concurrent calls with the same key wait for the first caller's result
+    instead of computing it again. Nothing is kept once the call finishes."""
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Return (fn(), shared): shared is True when another caller's result was reused.
+        Exceptions from fn propagate to every waiting caller."""
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return fut.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        return len(self._calls)
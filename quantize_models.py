@@ -0,0 +1,104 @@
+"""
+Post-training INT8 quantization of the stage1/stage2 stroke classifiers.
+
+Calibrates FX graph-mode static quantization on a folder of scans and saves
+frozen TorchScript modules that app.py serves when PREDICT_QUANTIZED=1.
+
+    python quantize_models.py --calib-dir scans/ --num-calib 200
+"""
+import argparse
+import copy
+import os
+import sys
+
+import torch
+from PIL import Image
+
+from stroke_models import load_classifier, preprocess_image
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+def list_images(folder, limit=None):
+    paths = []
+    for dirpath, _, names in os.walk(folder):
+        for name in sorted(names):
+            if name.lower().endswith(IMAGE_EXTS):
+                paths.append(os.path.join(dirpath, name))
+    paths.sort()
+    return paths[:limit] if limit else paths
+
+
+def calibration_batches(paths, batch_size=16):
+    batch = []
+    for path in paths:
+        try:
+            with Image.open(path) as img:
+                batch.append(preprocess_image(img))
+        except Exception:
+            continue
+        if len(batch) == batch_size:
+            yield torch.cat(batch)
+            batch = []
+    if batch:
+        yield torch.cat(batch)
+
+
+def quantize_classifier(model, calib_paths, engine="x86", batch_size=16):
+    """Static INT8 quantization of an eval-mode FP32 classifier, calibrated on calib_paths"""
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    torch.backends.quantized.engine = engine
+    example = torch.zeros(1, 1, 224, 224)
+    prepared = prepare_fx(copy.deepcopy(model).eval(), get_default_qconfig_mapping(engine), (example,))
+    seen = 0
+    with torch.inference_mode():
+        for x in calibration_batches(calib_paths, batch_size):
+            prepared(x)
+            seen += x.shape[0]
+    if seen == 0:
+        raise ValueError("no readable calibration images")
+    quantized = convert_fx(prepared)
+    with torch.no_grad():
+        traced = torch.jit.trace(quantized, example)
+    return torch.jit.freeze(traced)
+
+
+def load_quantized_classifier(path, engine="x86"):
+    """Load an INT8 TorchScript classifier written by this tool"""
+    torch.backends.quantized.engine = engine
+    model = torch.jit.load(path, map_location="cpu")
+    model.eval()
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Produce INT8 versions of the stroke classifiers")
+    parser.add_argument("--calib-dir", required=True, help="folder of representative scans")
+    parser.add_argument("--num-calib", type=int, default=200, help="max calibration images")
+    parser.add_argument("--stage1", default="best_stage1_model.pth")
+    parser.add_argument("--stage2", default="best_stage2_model.pth")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--engine", default="x86", choices=["x86", "fbgemm", "qnnpack", "onednn"])
+    args = parser.parse_args(argv)
+
+    calib = list_images(args.calib_dir, args.num_calib)
+    if not calib:
+        print(f"No images found in {args.calib_dir}")
+        return 1
+    print(f"Calibrating on {len(calib)} images")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for src in (args.stage1, args.stage2):
+        model = load_classifier(src)
+        q = quantize_classifier(model, calib, engine=args.engine)
+        name = os.path.splitext(os.path.basename(src))[0] + "_int8.pt"
+        out = os.path.join(args.out_dir, name)
+        torch.jit.save(q, out)
+        print(f"{src} -> {out} ({os.path.getsize(out) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Production entry point for the prediction server (Linux/macOS).
+
+The parent process loads both models once, then forks worker processes
+that share the listening socket and the weight memory copy-on-write.
+Each worker pins torch to its share of the cores so workers don't
+oversubscribe them.
+
+    python serve.py --workers 4 --port 5000
+
+Settings can also come from the environment: WEB_WORKERS, TORCH_THREADS,
+HOST, PORT. Model settings (PREDICT_*) are the same as for app.py.
+
+Each worker keeps its own /metrics counters, and a scrape reaches whichever
+worker accepts it. Every sample carries a worker="<pid>" label, so each series
+stays monotonic. Sum across workers in the query, e.g.
+sum without (worker) (rate(predictions_total[5m])).
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+
+def _worker(sock, threads, host, port):
+    import torch
+    from werkzeug.serving import make_server
+
+    import app as server
+
+    torch.set_num_threads(threads)
+    # every worker keeps its own metrics; label them so each series stays monotonic
+    server.metrics.worker_label = "worker"
+    # per-process allocator and JIT state can't be inherited, so warm up here
+    server.warmup_worker()
+    srv = make_server(host, port, server.app, threaded=True, fd=sock.fileno())
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        srv.serve_forever()
+    finally:
+        srv.server_close()
+
+
+def _spawn(sock, threads, host, port):
+    pid = os.fork()
+    if pid == 0:
+        # drop the parent's supervisor handlers
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            _worker(sock, threads, host, port)
+        except SystemExit as e:
+            code = e.code or 0
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        os._exit(code)
+    return pid
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Pre-fork multi-worker prediction server")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", cpus)))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("TORCH_THREADS", 0)),
+                        help="torch intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)))
+    parser.add_argument("--backlog", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        print("serve.py needs os.fork; on Windows run app.py behind waitress instead")
+        return 1
+
+    workers = max(1, args.workers)
+    threads = args.threads or max(1, cpus // workers)
+
+    import torch
+    # keep the parent single-threaded so no OpenMP pool exists at fork time
+    torch.set_num_threads(1)
+    import app as server
+    server.warmup_models(run_forwards=False)
+    # move everything allocated so far out of the GC's reach, so collections in
+    # the workers don't write to (and un-share) the parent's pages
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(args.backlog)
+    sock.set_inheritable(True)
+
+    print(f"Serving on {args.host}:{args.port} with {workers} workers x {threads} torch threads")
+    children = {_spawn(sock, threads, args.host, args.port) for _ in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {status}, restarting")
+            time.sleep(0.5)
+            children.add(_spawn(sock, threads, args.host, args.port))
+
+    sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
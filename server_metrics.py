@@ -0,0 +1,178 @@
+"""
+Minimal Prometheus-style metrics for the prediction server.
+Counters, gauges and histograms with optional labels, rendered in the
+Prometheus text exposition format. Each update is a dict lookup and a few
+additions under a lock, cheap enough to leave on in production.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Incremented with inc(), or pass fn to read an ever-growing total kept
+    elsewhere (e.g. a cache's hit count) at scrape time"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=(), fn=None):
+        if fn is not None and labelnames:
+            raise ValueError("callback counters cannot have labels")
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+        self._fn = fn
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        if self._fn is not None:
+            return self._fn()
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        if self._fn is not None:
+            return lines + [f"{self.name} {self._fn()}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, v in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {v}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Set directly, or pass fn to read the value at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None):
+        super().__init__(name, help_text)
+        self._value = 0
+        self._fn = fn
+
+    def set(self, value):
+        self._value = value
+
+    def value(self):
+        return self._fn() if self._fn is not None else self._value
+
+    def render(self):
+        return self.header() + [f"{self.name} {self.value()}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, ([*s[0]], s[1], s[2])) for k, s in self._series.items())
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, worker_label=None):
+        """
+        worker_label: when set, every sample gets this label with the current
+            process id. Each pre-fork worker keeps its own counters, so without
+            it a scrape that lands on another worker would see a counter jump
+            backwards. Aggregate with e.g. sum without (worker) (rate(...)).
+        """
+        self._metrics = []
+        self.worker_label = worker_label
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=(), fn=None):
+        return self._add(Counter(name, help_text, labelnames, fn))
+
+    def gauge(self, name, help_text, fn=None):
+        return self._add(Gauge(name, help_text, fn))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def _with_worker(self, line):
+        if line.startswith("#"):
+            return line
+        label = f'{self.worker_label}="{os.getpid()}"'
+        brace, space = line.find("{"), line.find(" ")
+        if 0 <= brace < space:
+            return f"{line[:brace + 1]}{label},{line[brace + 1:]}"
+        return f"{line[:space]}{{{label}}}{line[space:]}"
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        if self.worker_label:
+            lines = [self._with_worker(line) for line in lines]
+        return "\n".join(lines) + "\n"
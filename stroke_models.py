@@ -0,0 +1,211 @@
+"""
+Model construction and batched two-stage inference for the stroke classifier.
+Stage 1 separates Ischemic from the rest, stage 2 splits the rest into
+Hemorrhagic and Normal.
+"""
+import copy
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+import torch.nn as nn
+from PIL import Image
+
+CLASS_MAP = {0: "Hemorrhagic", 1: "Ischemic", 2: "Normal"}
+
+
+INPUT_SIZE = (224, 224)
+
+
+def decode_image(src, target=INPUT_SIZE):
+    """
+    Open src (a path or binary file object) as a grayscale image no smaller
+    than target, shrinking oversized scans while decoding. JPEGs are decoded
+    at a reduced DCT scale (draft mode, 1/2 to 1/8) and come out grayscale;
+    other formats are box-reduced by an integer factor before the grayscale
+    conversion, so the final resize only ever sees a small image.
+    """
+    img = Image.open(src)
+    if img.format == "JPEG":
+        img.draft("L", target)
+    if img.mode not in ("L", "LA", "RGB", "RGBA"):
+        img = img.convert("L")
+    factor = min(img.size[0] // target[0], img.size[1] // target[1])
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img if img.mode == "L" else img.convert("L")
+
+
+def preprocess_image(img, out=None):
+    """
+    Grayscale PIL image -> (1, 1, 224, 224) float32 tensor in [0, 1].
+    The uint8 pixels are scaled straight into the float32 result, so the
+    output tensor is the only full-size allocation. Pass out (a contiguous
+    (224, 224) float32 tensor, e.g. batch[i, 0]) to fill it in place instead.
+    """
+    if img.mode != "L":
+        img = img.convert("L")
+    if img.size != INPUT_SIZE:
+        img = img.resize(INPUT_SIZE)
+    if out is None:
+        out = torch.empty((1, 1) + INPUT_SIZE[::-1], dtype=torch.float32)
+    # out.numpy() is a view of the tensor's storage; the uint8 -> float32 cast is buffered
+    np.divide(np.asarray(img), np.float32(255.0), out=out.numpy(), dtype=np.float32)
+    return out
+
+
+def preprocess_batch(imgs):
+    """Preprocess several images into one preallocated (N, 1, 224, 224) float32 batch"""
+    batch = torch.empty((len(imgs), 1) + INPUT_SIZE[::-1], dtype=torch.float32)
+    for i, img in enumerate(imgs):
+        preprocess_image(img, out=batch[i, 0])
+    return batch
+
+
+def build_classifier():
+    """ResNet50 with a single-channel stem and a two-way head"""
+    # torchvision is slow to import, so only pay for it when a model is built
+    from torchvision import models
+    model = models.resnet50()
+    model.conv1 = nn.Conv2d(1, 64, kernel_size=7, stride=2, padding=3, bias=False)
+    model.fc = nn.Linear(model.fc.in_features, 2)
+    return model
+
+
+class _ChannelsLast(nn.Module):
+    """Feeds the wrapped model channels_last input so convolutions stay in NHWC"""
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x):
+        return self.model(x.contiguous(memory_format=torch.channels_last))
+
+
+def optimize_for_inference(model, mode="trace", example=None):
+    """
+    Return an optimized copy of an eval-mode classifier for serving.
+    mode: "trace" for a frozen TorchScript trace, "compile" for torch.compile.
+    Both run the network in channels_last memory format. model itself is left
+    untouched (its weights keep their layout and any mmap-backed storage).
+    """
+    model = _ChannelsLast(copy.deepcopy(model).eval().to(memory_format=torch.channels_last)).eval()
+    if mode == "compile":
+        return torch.compile(model)
+    if mode != "trace":
+        raise ValueError(f"unknown optimization mode: {mode}")
+    if example is None:
+        device = next(model.parameters()).device
+        example = torch.zeros(1, 1, 224, 224, device=device)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    return torch.jit.freeze(traced)
+
+
+def warmup(models, batch_sizes=(1,), device="cpu"):
+    """Run throwaway forwards so JIT compilation and allocator growth happen before real traffic"""
+    with torch.inference_mode():
+        for n in batch_sizes:
+            x = torch.zeros(n, 1, 224, 224, device=device)
+            for model in models:
+                model(x)
+
+
+def _resolve(out1, stage2_rows):
+    """
+    Turn stage 1 logits into final (label, confidence) tuples.
+    stage2_rows(rest) must return stage 2 logits for the row indices in rest.
+    """
+    prob1 = torch.softmax(out1, dim=1)
+    p1 = torch.argmax(out1, dim=1)
+
+    results = [None] * out1.shape[0]
+    for i in torch.nonzero(p1 == 1, as_tuple=True)[0].tolist():
+        results[i] = (CLASS_MAP[1], float(prob1[i, 1].item()))
+
+    rest = torch.nonzero(p1 != 1, as_tuple=True)[0]
+    if rest.numel() > 0:
+        out2 = stage2_rows(rest)
+        prob2 = torch.softmax(out2, dim=1)
+        p2 = torch.argmax(out2, dim=1)
+        for j, i in enumerate(rest.tolist()):
+            c = int(p2[j].item())
+            final = 0 if c == 0 else 2
+            results[i] = (CLASS_MAP[final], float(prob2[j, c].item()))
+    return results
+
+
+def run_cascade(stage1, stage2, x):
+    """
+    Run the two-stage cascade over a batch x of shape (N, 1, 224, 224).
+    Stage 2 only sees the rows stage 1 did not classify as Ischemic.
+    Returns a list of (label, confidence) tuples in input order.
+    """
+    with torch.inference_mode():
+        out1 = stage1(x)
+        return _resolve(out1, lambda rest: stage2(x[rest]))
+
+
+class SpeculativeCascade:
+    """
+    Latency mode: stage 1 and stage 2 run at the same time on two worker
+    threads, each with its own intra-op thread count, and the stage 2 rows
+    are discarded wherever stage 1 says Ischemic. Costs an extra stage 2
+    forward for Ischemic scans in exchange for one forward of latency.
+    """
+    def __init__(self, stage1, stage2, threads_per_stage=None):
+        self.stage1 = stage1
+        self.stage2 = stage2
+        n = threads_per_stage or max(1, torch.get_num_threads() // 2)
+        self.threads_per_stage = n
+        self._pools = [ThreadPoolExecutor(max_workers=1, initializer=torch.set_num_threads, initargs=(n,))
+                       for _ in range(2)]
+
+    @staticmethod
+    def _forward(model, x):
+        # inference_mode is thread-local, so enter it on the worker thread
+        with torch.inference_mode():
+            return model(x)
+
+    def __call__(self, x):
+        f1 = self._pools[0].submit(self._forward, self.stage1, x)
+        f2 = self._pools[1].submit(self._forward, self.stage2, x)
+        out1 = f1.result()
+        out2 = f2.result()
+        with torch.inference_mode():
+            return _resolve(out1, lambda rest: out2[rest])
+
+    def shutdown(self):
+        for pool in self._pools:
+            pool.shutdown(wait=True)
+
+
+def load_classifier(path, device="cpu", mmap=True):
+    """
+    Build a classifier and load an FP32 state_dict checkpoint into it.
+    With mmap the weights stay backed by the checkpoint file's pages, so
+    forked workers share them instead of each holding a private copy.
+    """
+    device = torch.device(device)
+    mmap = mmap and device.type == "cpu"
+    try:
+        # skip random init: every parameter is about to be replaced
+        with torch.device("meta"):
+            model = build_classifier()
+        state = torch.load(path, map_location=device, mmap=mmap, weights_only=True)
+        model.load_state_dict(state, assign=True)
+    except (TypeError, RuntimeError, AttributeError):
+        # older torch, or a legacy (non-zip) checkpoint that can't be mapped
+        model = build_classifier()
+        model.load_state_dict(torch.load(path, map_location=device))
+    return model.to(device).eval()
+
+
+def checkpoint_version(paths):
+    """Short content hash of the checkpoint files, used to key cached predictions"""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:16]
@@ -0,0 +1,14 @@
+import pytest
+import torch
+
+
+def _logits(pick):
+    # two-way logits whose argmax is 1 where pick is True
+    pick = pick.float()
+    return torch.stack([1 - pick, pick], dim=1)
+
+
+@pytest.fixture
+def logits():
+    """Builds fake stage outputs from a boolean row mask"""
+    return _logits
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, Overloaded
+
+
+def test_rejects_when_slots_and_queue_are_full():
+    ctl = AdmissionController(1, max_queue=1, timeout=5)
+    ctl.acquire()
+    queued = threading.Thread(target=ctl.acquire)
+    queued.start()
+    while ctl.waiting == 0:
+        time.sleep(0.001)
+
+    with pytest.raises(Overloaded) as exc:
+        ctl.acquire()
+    assert exc.value.reason == "queue_full"
+
+    ctl.release()
+    queued.join(5)
+    assert ctl.stats()["in_flight"] == 1 and ctl.waiting == 0
+    assert ctl.rejected == {"queue_full": 1, "timeout": 0}
+
+
+def test_queued_request_times_out():
+    ctl = AdmissionController(1, max_queue=4, timeout=0.05)
+    with ctl.admit():
+        with pytest.raises(Overloaded) as exc:
+            ctl.acquire()
+    assert exc.value.reason == "timeout"
+    assert ctl.in_flight == 0 and ctl.waiting == 0
+
+
+def test_waiter_behind_a_timed_out_one_is_admitted_on_release():
+    ctl = AdmissionController(1, max_queue=2, timeout=1.0)
+    outcome = {}
+
+    def request(name):
+        try:
+            with ctl.admit():
+                outcome[name] = "admitted"
+        except Overloaded as exc:
+            outcome[name] = exc.reason
+
+    ctl.acquire()
+    first = threading.Thread(target=request, args=("first",))
+    first.start()
+    while ctl.waiting < 1:
+        time.sleep(0.001)
+    time.sleep(0.5)  # the second waiter's deadline is half a second after the first's
+    second = threading.Thread(target=request, args=("second",))
+    second.start()
+    first.join(5)
+    assert outcome == {"first": "timeout"} and ctl.waiting == 1
+
+    ctl.release()
+    second.join(0.3)  # handed the slot now, not when its own timeout runs out
+    assert outcome == {"first": "timeout", "second": "admitted"}
+    assert ctl.in_flight == 0 and ctl.waiting == 0
+
+
+def test_release_hands_the_slot_to_the_queue_before_newcomers():
+    ctl = AdmissionController(1, max_queue=1, timeout=5)
+    admitted = threading.Event()
+
+    def queued():
+        with ctl.admit():
+            admitted.wait(5)
+
+    ctl.acquire()
+    t = threading.Thread(target=queued)
+    t.start()
+    while ctl.waiting < 1:
+        time.sleep(0.001)
+    ctl.release()
+    # the slot already belongs to the queued request, even if it hasn't run yet
+    assert ctl.in_flight == 1 and ctl.waiting == 0
+    admitted.set()
+    t.join(5)
+    assert ctl.in_flight == 0
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    ctl = AdmissionController(1, max_queue=8, timeout=5)
+    order = []
+
+    def request(i):
+        with ctl.admit():
+            order.append(i)
+
+    ctl.acquire()
+    threads = []
+    for i in range(5):
+        threads.append(threading.Thread(target=request, args=(i,)))
+        threads[-1].start()
+        while ctl.waiting < i + 1:
+            time.sleep(0.001)
+    ctl.release()
+    for t in threads:
+        t.join(5)
+    assert order == list(range(5))
+
+
+def test_disabled_controller_admits_everything():
+    ctl = AdmissionController(0)
+    for _ in range(100):
+        ctl.acquire()
+    assert not ctl.enabled and ctl.in_flight == 0
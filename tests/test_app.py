@@ -0,0 +1,134 @@
+import io
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+import app as server
+from stroke_models import build_classifier
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # random stand-in weights with the real architecture
+    d = tmp_path_factory.mktemp("ckpt")
+    for i, name in enumerate(("stage1.pth", "stage2.pth")):
+        torch.manual_seed(i)
+        torch.save(build_classifier().state_dict(), d / name)
+    mp = pytest.MonkeyPatch()
+    mp.setattr(server, "STAGE1_CHECKPOINT", str(d / "stage1.pth"))
+    mp.setattr(server, "STAGE2_CHECKPOINT", str(d / "stage2.pth"))
+    mp.setattr(server, "_models", None)
+    yield server.app.test_client()
+    mp.undo()
+
+
+def _png(value):
+    buf = io.BytesIO()
+    Image.fromarray(np.full((64, 80), value, dtype=np.uint8)).save(buf, format="PNG")
+    buf.seek(0)
+    return buf
+
+
+def test_import_does_not_load_models(client):
+    assert server._models is None
+    assert client.get("/healthz").status_code == 200
+    assert client.get("/readyz").status_code == 503
+
+
+def test_predict_loads_models_on_first_use(client):
+    r = client.post("/api/predict", data={"image": (_png(40), "scan.png")},
+                    content_type="multipart/form-data")
+    assert r.status_code == 200
+    assert r.json["prediction"] in ("Hemorrhagic", "Ischemic", "Normal")
+    assert client.get("/readyz").status_code == 200
+
+    report = client.get("/api/startup").json
+    assert report["loaded"] is True
+    assert "load_stage1" in report["phases"]
+
+
+def test_worker_warmup_stays_out_of_stage_metrics(client):
+    server.get_models()
+    before = server.STAGE_SECONDS.count(stage="stage1"), server.STAGE_SECONDS.count(stage="stage2")
+    server.warmup_worker()
+    assert (server.STAGE_SECONDS.count(stage="stage1"), server.STAGE_SECONDS.count(stage="stage2")) == before
+
+
+def test_oversized_upload_is_rejected_before_buffering(client, monkeypatch):
+    monkeypatch.setitem(server.app.config, "MAX_CONTENT_LENGTH", 1024)
+    payload = io.BytesIO(np.random.default_rng(0).integers(0, 256, 4096, dtype=np.uint8).tobytes())
+    r = client.post("/api/predict", data={"image": (payload, "big.png")}, content_type="multipart/form-data")
+    assert r.status_code == 413
+    assert r.json["success"] is False
+
+
+def test_predict_volume_endpoint(client):
+    buf = io.BytesIO()
+    np.save(buf, np.random.default_rng(1).integers(0, 256, (3, 64, 64), dtype=np.uint8))
+    buf.seek(0)
+    r = client.post("/api/predict/volume", data={"volume": (buf, "scan.npy")}, content_type="multipart/form-data")
+    assert r.status_code == 200
+    assert len(r.json["slices"]) == 3
+    assert r.json["aggregate"]["slices"] == 3
+
+    r = client.post("/api/predict/volume", data={"volume": (io.BytesIO(b"x"), "scan.dcm")},
+                    content_type="multipart/form-data")
+    assert r.status_code == 400
+
+
+def test_volume_upload_has_its_own_limit_and_is_spooled_to_disk(client, monkeypatch):
+    monkeypatch.setitem(server.app.config, "MAX_CONTENT_LENGTH", 1024)
+    seen = []
+    real = server.iter_slices
+    monkeypatch.setattr(server, "iter_slices",
+                        lambda stream, **kw: seen.append(hasattr(stream, "getbuffer")) or real(stream, **kw))
+    buf = io.BytesIO()
+    np.save(buf, np.zeros((4, 64, 64), dtype=np.uint8))  # 16 KB, over the image limit
+    data = buf.getvalue()
+    r = client.post("/api/predict/volume", data={"volume": (io.BytesIO(data), "scan.npy")}, content_type="multipart/form-data")
+    assert r.status_code == 200
+    assert len(r.json["slices"]) == 4
+    assert seen == [False]  # a temp file, not an in-memory buffer
+
+    monkeypatch.setattr(server, "PREDICT_MAX_VOLUME_MB", 0.01)
+    r = client.post("/api/predict/volume", data={"volume": (io.BytesIO(data), "scan.npy")}, content_type="multipart/form-data")
+    assert r.status_code == 413
+    assert "0.01 MB" in r.json["error"]
+
+
+def test_overload_returns_503_with_retry_after(client, monkeypatch):
+    from admission import AdmissionController
+    busy = AdmissionController(1, max_queue=0, retry_after=3)
+    monkeypatch.setattr(server, "admission", busy)
+    with busy.admit():
+        r = client.post("/api/predict", data={"image": (_png(40), "scan.png")}, content_type="multipart/form-data")
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "3"
+    assert r.json["admission"]["rejected"]["queue_full"] == 1
+
+
+def test_predict_batch_reports_per_image_results_and_errors(client, monkeypatch, logits):
+    stage2_rows = []
+
+    def stage1(x):
+        return logits(x.mean(dim=(1, 2, 3)) > 0.5)
+
+    def stage2(x):
+        stage2_rows.extend(round(v * 255) for v in x.mean(dim=(1, 2, 3)).tolist())
+        return logits(x.mean(dim=(1, 2, 3)) > 0.2)
+
+    monkeypatch.setattr(server, "_models", server.LoadedModels(stage1, stage2, "test"))
+    monkeypatch.setattr(server, "prediction_cache", server.PredictionCache(max_entries=0))
+    files = [(_png(200), "a.png"), (io.BytesIO(b"not an image"), "broken.png"),
+             (_png(30), "b.png"), (_png(100), "c.png")]
+    r = client.post("/api/predict/batch", data={"images": files}, content_type="multipart/form-data")
+    assert r.status_code == 200
+    assert r.json["success"] and r.json["count"] == 4
+    results = r.json["results"]
+    assert [x["filename"] for x in results] == ["a.png", "broken.png", "b.png", "c.png"]
+    assert [x["success"] for x in results] == [True, False, True, True]
+    assert [x.get("prediction") for x in results] == ["Ischemic", None, "Hemorrhagic", "Normal"]
+    assert results[1]["error"] and not any("error" in x for i, x in enumerate(results) if i != 1)
+    # only the non-Ischemic images went through stage 2
+    assert stage2_rows == [30, 100]
@@ -0,0 +1,50 @@
+import threading
+import pytest
+from batching import MicroBatcher
+
+
+def test_concurrent_requests_are_batched_and_resolved_in_order():
+    sizes = []
+
+    def fn(items):
+        sizes.append(len(items))
+        return [x * 2 for x in items]
+
+    b = MicroBatcher(fn, max_batch_size=4, max_wait_ms=50)
+    results = {}
+    start = threading.Barrier(8)
+
+    def worker(i):
+        start.wait()
+        results[i] = b.predict(i, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    b.stop()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert sum(sizes) == 8
+    assert max(sizes) <= 4
+    assert len(sizes) < 8
+
+
+def test_errors_propagate_to_every_caller():
+    def fn(items):
+        raise ValueError("boom")
+
+    b = MicroBatcher(fn, max_batch_size=2, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        b.predict(1, timeout=5)
+    b.stop()
+
+
+def test_short_result_list_fails_every_caller_instead_of_hanging():
+    b = MicroBatcher(lambda items: items[:-1], max_batch_size=3, max_wait_ms=1000)
+    futures = [b.submit(i) for i in range(3)]
+    for fut in futures:
+        with pytest.raises(RuntimeError):
+            fut.result(timeout=5)
+    b.stop()
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+from camera_service import CameraService
+
+
+class FakeCapture:
+    """Yields numbered frames; each read blocks until the test releases one"""
+    def __init__(self, index):
+        self.n = 0
+        self.sem = threading.Semaphore(0)
+        self.released = False
+
+    def set(self, prop, value):
+        return True
+
+    def read(self):
+        if not self.sem.acquire(timeout=0.05):
+            return False, None
+        self.n += 1
+        return True, np.full((4, 4, 3), self.n, dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+def _service():
+    caps = []
+    svc = CameraService(capture_factory=lambda i: caps.append(FakeCapture(i)) or caps[-1])
+    svc.start()
+    while not caps:
+        time.sleep(0.001)
+    return svc, caps[0]
+
+
+def test_read_returns_only_the_newest_unread_frame():
+    svc, cap = _service()
+    try:
+        assert svc.read() == (False, None)
+        for _ in range(3):
+            cap.sem.release()
+        while svc.frames < 3:
+            time.sleep(0.001)
+        ok, frame = svc.read(timeout=1)
+        assert ok and frame[0, 0, 0] == 3
+        assert svc.dropped == 2
+        # nothing new since the last read
+        assert svc.read() == (False, None)
+
+        cap.sem.release()
+        ok, frame = svc.read(timeout=1)
+        assert ok and frame[0, 0, 0] == 4
+    finally:
+        svc.stop()
+    assert cap.released
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+from canvas_renderer import CanvasRenderer
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.items = []
+        self.lowered = []
+
+    def create_image(self, x, y, anchor=None, image=None):
+        self.items.append(image)
+        return len(self.items)
+
+    def itemconfigure(self, item, image=None):
+        self.items[item - 1] = image
+
+    def tag_lower(self, item):
+        self.lowered.append(item)
+
+
+class FakePhoto:
+    def __init__(self, image):
+        self.size = image.size
+        self.pasted = []
+
+    def paste(self, image):
+        self.pasted.append(image.getpixel((0, 0)))
+
+
+def test_one_image_item_updated_in_place_with_rgb_pixels():
+    canvas = FakeCanvas()
+    renderer = CanvasRenderer(canvas, photo_factory=FakePhoto)
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(5):
+        frame[..., 0], frame[..., 2] = i, 100 + i  # BGR
+        renderer.show(frame)
+
+    assert len(canvas.items) == 1 and canvas.lowered == [1]
+    photo = canvas.items[0]
+    assert photo.size == (6, 4)
+    assert photo.pasted == [(100 + i, 0, i) for i in range(5)]
+    renderer.show(frame[..., ::-1], bgr=False)  # RGB input, not contiguous
+    assert photo.pasted[-1] == (104, 0, 4)
+
+    renderer.show(np.zeros((8, 6, 3), dtype=np.uint8))  # a new frame size swaps the photo, not the item
+    assert len(canvas.items) == 1 and canvas.items[0] is not photo
+    assert renderer.stats()["frames"] == 7 and renderer.rebuilds == 2
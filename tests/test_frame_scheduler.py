@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+from frame_scheduler import FrameScheduler
+from hand_tracking import FrameHands
+
+
+class FakeRoot:
+    """Records after() calls instead of running a Tk event loop"""
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, fn, *args):
+        self.calls.append((ms, fn, args))
+        return len(self.calls)
+
+    def after_cancel(self, after_id):
+        self.calls[after_id - 1] = None
+
+
+class Clock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def run_frames(root, clock, work_s):
+    """Drive the scheduled updates, each taking the next work_s seconds"""
+    for work in work_s:
+        delay_ms, fn, args = root.calls[-1]
+        clock.t += delay_ms / 1000
+        fn(*args)
+        clock.t += work
+
+
+def test_delay_shrinks_with_work_and_late_frames_skip_inference():
+    root, clock = FakeRoot(), Clock()
+    pacer = FrameScheduler(root, target_fps=20, clock=clock)  # 50 ms budget
+    skips = []
+
+    def update():
+        skips.append(pacer.skip_inference())
+        clock.t += work.pop(0)
+        pacer.next(update)
+
+    work = [0.010, 0.030, 0.120, 0.010, 0.010]
+    pacer.start(update)
+    assert root.calls[-1][0] == 40
+    run_frames(root, clock, [0] * 4)
+    delays = [c[0] for c in root.calls]
+    assert delays[:2] == [40, 20]
+    assert delays[2] == 0  # 120 ms frame: run the next one right away
+    assert skips == [False, False, False, True, False]
+    stats = pacer.stats()
+    assert stats["late"] == 1 and stats["dropped"] == 1 and stats["skipped_inference"] == 1
+    assert stats["frames"] == 5 and stats["target_fps"] == 20.0
+
+
+def test_polls_wait_for_the_cameras_next_frame():
+    root, clock = FakeRoot(), Clock()
+    pacer = FrameScheduler(root, target_fps=30, clock=clock)
+    arrivals = iter([True, False, True, False, True, False])
+
+    def update():
+        if not next(arrivals):
+            pacer.retry(update)
+            return
+        pacer.next(update)
+
+    pacer.start(update)
+    # camera delivers every ~50 ms, slower than the 33 ms target
+    run_frames(root, clock, [0.017, 0, 0.017, 0])
+    assert pacer.polls == 2 and pacer.late == 0
+    # after learning the camera interval, the poll waits for the expected frame instead of 10 ms
+    assert root.calls[-1][0] == 33
+
+
+def test_reused_frames_keep_previous_landmarks():
+    class Detector:
+        calls = 0
+
+        def process(self, rgb):
+            Detector.calls += 1
+            return Detector.calls
+
+    hands = FrameHands(Detector())
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    hands.next_frame(reuse=True)  # nothing to reuse yet
+    assert hands.process(frame) == 1
+    hands.next_frame(reuse=True)
+    assert hands.process(frame) == 1 and hands.skipped == 1
+    hands.next_frame()
+    assert hands.process(frame) == 2
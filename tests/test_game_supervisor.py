@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from game_supervisor import GameSupervisor
+
+FAKE_GAME = """
+import sys
+print("READY 0.25", flush=True)
+for line in sys.stdin:
+    if line.strip() == "quit":
+        break
+    print("got", line.strip(), flush=True)
+"""
+
+
+@pytest.fixture
+def supervisor(tmp_path):
+    script = tmp_path / "fake_game.py"
+    script.write_text(FAKE_GAME)
+    sup = GameSupervisor([sys.executable, str(script)], state_dir=str(tmp_path / "state"))
+    yield sup
+    sup.stop()
+
+
+def _wait(cond, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_second_launch_reuses_the_warm_process(supervisor):
+    first, action = supervisor.launch("bay1")
+    assert action == "started"
+    game = supervisor._games["bay1"]
+    _wait(game.ready.is_set)
+
+    second, action = supervisor.launch("bay1")
+    assert action == "reused" and second["pid"] == first["pid"]
+    _wait(lambda: "got show" in game.output)
+
+    status = supervisor.status()
+    assert supervisor.launches == 1
+    assert status["games"]["bay1"]["state"] == "ready"
+    assert status["games"]["bay1"]["game_reported_startup_s"] == 0.25
+    assert status["games"]["bay1"]["startup_s"] is not None
+
+
+def test_exited_game_is_restarted_and_stop_cleans_up(supervisor):
+    first, _ = supervisor.launch("bay1")
+    supervisor._games["bay1"].proc.stdin.close()
+    _wait(lambda: not supervisor._games["bay1"].alive())
+    assert supervisor.status()["games"]["bay1"]["state"] == "exited"
+    # reported once, then reaped along with its pidfile
+    assert supervisor.status()["games"] == {}
+    assert not os.path.exists(supervisor._pidfile("bay1"))
+
+    second, action = supervisor.launch("bay1")
+    assert action == "started" and second["pid"] != first["pid"]
+    supervisor.stop("bay1")
+    assert supervisor.status()["games"] == {}
+    assert not os.path.exists(supervisor._pidfile("bay1"))
+
+
+def test_orphans_of_dead_servers_are_killed(supervisor):
+    orphan = subprocess.Popen(supervisor.cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    os.makedirs(supervisor.state_dir)
+    with open(supervisor._pidfile("old"), "w") as f:
+        f.write(f"{orphan.pid} {dead.pid}\n")
+
+    assert supervisor.kill_orphans() == [orphan.pid]
+    assert orphan.wait(10) is not None
+    assert not os.path.exists(supervisor._pidfile("old"))
+
+
+LAUNCH_ELSEWHERE = """
+import sys
+sys.path.insert(0, {root!r})
+from game_supervisor import GameSupervisor
+sup = GameSupervisor({cmd!r}, state_dir={state_dir!r})
+print("launching", flush=True)
+status, action = sup.launch("bay1")
+print(action, flush=True)
+sup.stop()
+"""
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the station lock needs fcntl")
+def test_sibling_process_waits_for_the_station_lock_and_rechecks(supervisor):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = LAUNCH_ELSEWHERE.format(root=root, cmd=supervisor.cmd, state_dir=supervisor.state_dir)
+    with supervisor._station_lock("bay1"):
+        sibling = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+        assert sibling.stdout.readline().strip() == "launching"
+        time.sleep(0.3)  # the sibling is now blocked on the lock, past any check of its own
+        game = supervisor._games["bay1"] = supervisor._spawn("bay1")
+    assert sibling.stdout.readline().strip() == "running_elsewhere"
+    assert sibling.wait(10) == 0
+    assert supervisor.launches == 1 and game.alive()
+
+
+def test_invalid_station_is_rejected(supervisor):
+    with pytest.raises(ValueError):
+        supervisor.launch("../etc")
@@ -0,0 +1,165 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+from hand_tracking import FrameHands, HandsPool, RoiHands
+
+
+class FakeHands:
+    def __init__(self, **config):
+        self.config = config
+        self.calls = 0
+        self.resets = 0
+        self.closed = False
+
+    def reset(self):
+        self.resets += 1
+
+    def process(self, rgb):
+        self.calls += 1
+        return ("landmarks", self.calls)
+
+    def close(self):
+        self.closed = True
+
+
+def test_landmarks_computed_once_per_frame():
+    fake = FakeHands()
+    hands = FrameHands(fake)
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    for i in range(1, 4):
+        hands.next_frame()
+        assert hands.results is None
+        first = hands.process(frame)
+        assert hands.process_bgr(frame) is first
+        assert hands.process(frame) is first
+        assert first == ("landmarks", i)
+
+    assert fake.calls == 3
+    assert (hands.frames, hands.inferences, hands.reused) == (3, 3, 6)
+    hands.close()
+    assert fake.closed
+
+
+def test_pool_reuses_and_resets_one_graph_per_config():
+    pool = HandsPool(factory=FakeHands, restart_graphs=True)
+    pool.warm(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+
+    first = pool.acquire(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    assert first.hands.resets == 0  # warmed graph is used as built
+    first.close()  # levels' close() must not destroy the shared graph
+    assert not first.hands.closed
+
+    again = pool.acquire(min_tracking_confidence=0.5, min_detection_confidence=0.7, max_num_hands=2)
+    assert again is first and first.hands.resets == 1
+    assert (pool.reuses, pool.resets) == (1, 1)
+    single = pool.acquire(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    assert single is not first and single.hands.config["max_num_hands"] == 1
+    assert pool.stats()["graphs"] == 2 and pool.created == 2
+
+    # a caller feeding its own frames (dl_utils.HandTracker) never shares the levels' graph
+    own = pool.warm(stream="dl_utils", min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    assert own is not first and own.hands.config == first.hands.config
+    assert pool.acquire(stream="dl_utils", min_detection_confidence=0.7, min_tracking_confidence=0.5) is own
+
+    pool.close()
+    assert first.hands.closed and single.hands.closed and own.hands.closed
+
+
+def test_pool_without_graph_restarts_reports_no_resets():
+    pool = HandsPool(factory=FakeHands)
+    first = pool.acquire(min_detection_confidence=0.7)
+    for _ in range(3):
+        assert pool.acquire(min_detection_confidence=0.7) is first
+    assert first.hands.resets == 0
+    stats = pool.stats()
+    assert (stats["reuses"], stats["resets"]) == (3, 0)
+
+
+class MarkerHands:
+    """Finds a white square and reports 21 landmarks spread over it, in the
+    coordinates of whatever image it was given"""
+    def __init__(self):
+        self.shapes = []
+
+    def process(self, rgb):
+        from types import SimpleNamespace as NS
+        self.shapes.append(rgb.shape[:2])
+        ys, xs = np.nonzero(rgb[..., 0] == 255)
+        if not len(xs):
+            return NS(multi_hand_landmarks=None)
+        h, w = rgb.shape[:2]
+        points = [NS(x=(xs.min() + (xs.max() - xs.min()) * j / 20) / w, y=(ys.min() + ys.max()) / 2 / h, z=0.1)
+                  for j in range(21)]
+        return NS(multi_hand_landmarks=[NS(landmark=points)])
+
+
+def marker_frame(x, y):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    if x is not None:
+        frame[y:y + 40, x:x + 40] = 255
+    return frame
+
+
+def test_roi_tracking_crops_maps_back_and_falls_back():
+    detector, crops = MarkerHands(), MarkerHands()
+    hands = RoiHands(detector, crops, refresh_every=100)
+
+    first = hands.process(marker_frame(300, 200))
+    assert detector.shapes[-1] == (480, 640)
+    tip = first.multi_hand_landmarks[0].landmark[20]
+    assert (tip.x * 640, tip.y * 480) == pytest.approx((339, 219.5))
+
+    moved = hands.process(marker_frame(310, 205))  # small move: found inside the crop
+    crop_h, crop_w = crops.shapes[-1]
+    assert crop_w == crop_h == 128
+    tip = moved.multi_hand_landmarks[0].landmark[20]
+    assert (tip.x * 640, tip.y * 480) == pytest.approx((349, 224.5))
+    assert tip.z == pytest.approx(0.1 * 128 / 640)
+
+    jumped = hands.process(marker_frame(20, 20))  # outside the crop: retried on the full frame
+    assert crops.shapes[-1] == (128, 128) and len(detector.shapes) == 2
+    assert round(jumped.multi_hand_landmarks[0].landmark[0].x * 640) == 20
+
+    assert hands.process(marker_frame(None, None)).multi_hand_landmarks is None
+    hands.process(marker_frame(20, 20))
+    assert len(detector.shapes) == 4 and len(crops.shapes) == 3  # nothing tracked last frame: full frame
+    # the video-mode graph only ever sees full frames, so its tracked region stays valid
+    assert set(detector.shapes) == {(480, 640)}
+    assert hands.stats() == {"roi_frames": 1, "full_frames": 4, "fallbacks": 2, "recenters": 1}
+
+
+def test_roi_landmarks_consistent_across_crop_full_crop():
+    detector, crops = MarkerHands(), MarkerHands()
+    hands = RoiHands(detector, crops, refresh_every=2)
+    tips = []
+    for _ in range(7):  # full, crop, crop, full (refresh), crop, crop, full
+        results = hands.process(marker_frame(300, 200))
+        tip = results.multi_hand_landmarks[0].landmark[20]
+        tips.append((tip.x * 640, tip.y * 480))
+    assert tips == pytest.approx([(339, 219.5)] * 7)
+    assert hands.stats() == {"roi_frames": 4, "full_frames": 3, "fallbacks": 0, "recenters": 0}
+    assert set(detector.shapes) == {(480, 640)} and set(crops.shapes) == {(128, 128)}
+
+
+def test_roi_crop_stays_put_until_the_hand_nears_its_border():
+    detector, crops = MarkerHands(), MarkerHands()
+    hands = RoiHands(detector, crops, refresh_every=100)
+    hands.process(marker_frame(300, 200))
+    roi = hands._roi
+    for x in (305, 310, 290, 300):  # small moves inside the crop: same frame of reference
+        tip = hands.process(marker_frame(x, 200)).multi_hand_landmarks[0].landmark[20]
+        assert hands._roi == roi and round(tip.x * 640) == x + 39
+    hands.process(marker_frame(340, 200))  # near the right border: the crop moves once
+    assert hands._roi != roi and hands._roi[0] > roi[0]
+    assert hands.stats() == {"roi_frames": 5, "full_frames": 1, "fallbacks": 0, "recenters": 1}
+
+
+def test_pool_builds_a_second_graph_for_roi_crops():
+    pool = HandsPool(factory=FakeHands, roi=True)
+    hands = pool.acquire(min_detection_confidence=0.7)
+    assert hands.hands.crop_hands is not hands.hands.hands
+    assert hands.hands.crop_hands.config == hands.hands.hands.config
+    assert pool.created == 1
+    pool.close()
+    assert hands.hands.hands.closed and hands.hands.crop_hands.closed
@@ -0,0 +1,42 @@
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+
+from onnx_backend import OnnxClassifier, export_onnx
+from stroke_models import build_classifier, run_cascade
+
+
+def test_onnx_cascade_matches_torch(tmp_path):
+    torch.manual_seed(0)
+    stage1 = build_classifier().eval()
+    stage2 = build_classifier().eval()
+    onnx1 = OnnxClassifier(export_onnx(stage1, str(tmp_path / "stage1.onnx")))
+    onnx2 = OnnxClassifier(export_onnx(stage2, str(tmp_path / "stage2.onnx")))
+
+    x = torch.rand(3, 1, 224, 224)
+    with torch.inference_mode():
+        assert torch.allclose(onnx1(x), stage1(x), atol=1e-4)
+        assert torch.allclose(onnx2(x), stage2(x), atol=1e-4)
+
+    expected = run_cascade(stage1, stage2, x)
+    actual = run_cascade(onnx1, onnx2, x)
+    assert [label for label, _ in actual] == [label for label, _ in expected]
+    for (_, a), (_, e) in zip(actual, expected):
+        assert abs(a - e) < 1e-4
+
+
+def test_session_is_created_lazily_per_process(tmp_path, monkeypatch):
+    path = export_onnx(build_classifier().eval(), str(tmp_path / "stage1.onnx"))
+    clf = OnnxClassifier(path, share=2)
+    assert clf._session is None  # a pre-fork parent never builds one
+
+    monkeypatch.setattr(torch, "get_num_threads", lambda: 6)
+    x = torch.rand(1, 1, 224, 224)
+    first = clf(x)
+    session = clf.session
+    assert session.get_session_options().intra_op_num_threads == 3
+    assert clf.session is session
+
+    monkeypatch.setattr(clf, "_pid", -1)  # as seen from a forked child
+    assert torch.allclose(clf(x), first) and clf.session is not session
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+from PIL import Image
+from prediction_cache import PredictionCache, SingleFlight, content_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    c = PredictionCache(max_entries=2)
+    c.put("a", ("Normal", 0.9))
+    c.put("b", ("Ischemic", 0.8))
+    assert c.get("a") == ("Normal", 0.9)  # a becomes most recent
+    c.put("c", ("Hemorrhagic", 0.7))      # evicts b
+    assert c.get("b") is None
+    assert c.get("c") == ("Hemorrhagic", 0.7)
+
+    stats = c.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    c = PredictionCache(max_entries=4, ttl=10, clock=clock)
+    c.put("a", ("Normal", 0.9))
+    clock.now = 5
+    assert c.get("a") is not None
+    clock.now = 16
+    assert c.get("a") is None
+    assert c.stats()["expirations"] == 1
+
+
+def test_content_key_depends_on_pixels_and_version():
+    a = Image.new("L", (4, 4), 10)
+    b = Image.new("L", (4, 4), 11)
+    assert content_key(a, "v1") == content_key(a.copy(), "v1")
+    assert content_key(a, "v1") != content_key(b, "v1")
+    assert content_key(a, "v1") != content_key(a, "v2")
+
+
+def test_single_flight_shares_one_computation():
+    sf = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return ("Normal", 0.9)
+
+    threads = [threading.Thread(target=lambda: results.append(sf.do("k", compute))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while sf.coalesced < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(value == ("Normal", 0.9) for value, _ in results)
+    assert sf.in_flight() == 0
+    # finished calls are not remembered
+    assert sf.do("k", lambda: ("Ischemic", 0.5)) == (("Ischemic", 0.5), False)
+
+
+def test_single_flight_propagates_errors():
+    def fail():
+        raise RuntimeError("boom")
+
+    sf = SingleFlight()
+    with pytest.raises(RuntimeError):
+        sf.do("k", fail)
+    assert sf.in_flight() == 0
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from quantize_models import list_images, load_quantized_classifier, quantize_classifier
+from stroke_models import build_classifier
+
+
+def test_quantize_save_and_reload_round_trip(tmp_path):
+    if "x86" not in torch.backends.quantized.supported_engines:
+        pytest.skip("x86 quantized engine not available")
+    rng = np.random.default_rng(0)
+    for i in range(3):
+        Image.fromarray(rng.integers(0, 256, (96, 96), dtype=np.uint8)).save(tmp_path / f"calib{i}.png")
+    (tmp_path / "notes.txt").write_text("not a scan")
+    calib = list_images(str(tmp_path))
+    assert len(calib) == 3
+
+    torch.manual_seed(0)
+    q = quantize_classifier(build_classifier().eval(), calib, batch_size=2)
+    torch.jit.save(q, str(tmp_path / "stage1_int8.pt"))
+    loaded = load_quantized_classifier(str(tmp_path / "stage1_int8.pt"))
+    with torch.inference_mode():
+        out = loaded(torch.rand(2, 1, 224, 224))
+    assert out.shape == (2, 2) and out.dtype == torch.float32
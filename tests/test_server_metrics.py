@@ -0,0 +1,49 @@
+from server_metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    reg = MetricsRegistry()
+    h = reg.histogram("latency_seconds", "test", labelnames=("stage",), buckets=(0.1, 1.0))
+    h.observe(0.05, stage="decode")
+    h.observe(0.5, stage="decode")
+    h.observe(5.0, stage="decode")
+    text = reg.render()
+
+    assert 'latency_seconds_bucket{stage="decode",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="decode",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{stage="decode",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="decode"} 3' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_counters_and_callback_gauges():
+    reg = MetricsRegistry()
+    c = reg.counter("predictions_total", "test", labelnames=("label",))
+    c.inc(label="Normal")
+    c.inc(2, label="Ischemic")
+    depth = [3]
+    reg.gauge("queue_depth", "test", fn=lambda: depth[0])
+    hits = reg.counter("cache_hits_total", "test", fn=lambda: depth[0] * 2)
+    text = reg.render()
+
+    assert 'predictions_total{label="Ischemic"} 2' in text
+    assert 'predictions_total{label="Normal"} 1' in text
+    assert "queue_depth 3" in text
+    assert "# TYPE cache_hits_total counter\ncache_hits_total 6" in text
+    assert hits.value() == 6
+
+
+def test_worker_label_marks_every_sample_with_the_pid():
+    import os
+    reg = MetricsRegistry(worker_label="worker")
+    reg.counter("hits_total", "test", fn=lambda: 4)
+    reg.counter("predictions_total", "test", labelnames=("label",)).inc(label="Normal")
+    reg.histogram("latency_seconds", "test", buckets=(1.0,)).observe(0.5)
+    text = reg.render()
+    pid = os.getpid()
+
+    assert f'hits_total{{worker="{pid}"}} 4' in text
+    assert f'predictions_total{{worker="{pid}",label="Normal"}} 1' in text
+    assert f'latency_seconds_bucket{{worker="{pid}",le="1.0"}} 1' in text
+    assert f'latency_seconds_count{{worker="{pid}"}} 1' in text
+    assert "# TYPE hits_total counter" in text
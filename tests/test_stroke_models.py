@@ -0,0 +1,100 @@
+import io
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from stroke_models import (build_classifier, run_cascade, optimize_for_inference, SpeculativeCascade,
+                           decode_image, preprocess_image, preprocess_batch)
+
+
+def test_cascade_routes_only_non_ischemic_rows_to_stage2(logits):
+    seen = []
+
+    def stage1(x):
+        return logits(x.mean(dim=(1, 2, 3)) > 0.5)
+
+    def stage2(x):
+        seen.append(x.shape[0])
+        return logits(x.mean(dim=(1, 2, 3)) > 0.2)
+
+    x = torch.stack([torch.full((1, 224, 224), v) for v in (0.9, 0.1, 0.3, 0.7)])
+    labels = [label for label, _ in run_cascade(stage1, stage2, x)]
+
+    assert labels == ["Ischemic", "Hemorrhagic", "Normal", "Ischemic"]
+    assert seen == [2]
+
+
+def test_speculative_cascade_matches_sequential(logits):
+    def stage1(x):
+        return logits(x.mean(dim=(1, 2, 3)) > 0.5)
+
+    def stage2(x):
+        return logits(x.mean(dim=(1, 2, 3)) > 0.2)
+
+    x = torch.stack([torch.full((1, 224, 224), v) for v in (0.9, 0.1, 0.3, 0.7)])
+    spec = SpeculativeCascade(stage1, stage2, threads_per_stage=1)
+    try:
+        assert spec(x) == run_cascade(stage1, stage2, x)
+    finally:
+        spec.shutdown()
+
+
+def test_batched_cascade_matches_single_image_predictions():
+    torch.manual_seed(0)
+    stage1 = build_classifier().eval()
+    stage2 = build_classifier().eval()
+    x = torch.rand(3, 1, 224, 224)
+
+    batched = run_cascade(stage1, stage2, x)
+    single = [run_cascade(stage1, stage2, x[i:i + 1])[0] for i in range(3)]
+
+    for (lb, cb), (ls, cs) in zip(batched, single):
+        assert lb == ls
+        assert abs(cb - cs) < 1e-4
+
+
+def test_traced_channels_last_model_matches_eager_outputs():
+    torch.manual_seed(0)
+    eager = build_classifier().eval()
+    x = torch.rand(2, 1, 224, 224)
+    weights = {k: (v.clone(), v.is_contiguous()) for k, v in eager.state_dict().items()}
+
+    traced = optimize_for_inference(eager, "trace")
+    # the eager model is not converted in place
+    for k, v in eager.state_dict().items():
+        assert torch.equal(v, weights[k][0]) and v.is_contiguous() == weights[k][1]
+    with torch.inference_mode():
+        expected = eager(x)
+        # batch size differs from the trace example on purpose
+        actual = traced(x)
+
+    assert torch.allclose(actual, expected, atol=1e-4)
+
+
+def test_float32_preprocessing_matches_float64_reference():
+    # every pixel value appears, so the scaling is checked for all of them
+    pixels = np.tile(np.arange(256, dtype=np.uint8), 224 * 224 // 256 + 1)[:224 * 224].reshape(224, 224)
+    img = Image.fromarray(pixels)
+    reference = torch.tensor(np.array(img) / 255.0).unsqueeze(0).unsqueeze(0).float()
+
+    x = preprocess_image(img)
+    assert x.dtype == torch.float32
+    assert torch.equal(x, reference)
+
+    batch = preprocess_batch([img, Image.fromarray(255 - pixels)])
+    assert batch.shape == (2, 1, 224, 224)
+    assert torch.equal(batch[0:1], reference)
+
+
+@pytest.mark.parametrize("fmt,mode", [("JPEG", "RGB"), ("PNG", "L"), ("PNG", "P")])
+def test_decode_image_downscales_large_scans(fmt, mode):
+    yy, xx = np.mgrid[0:2000, 0:1600]
+    img = Image.fromarray(((xx + yy) % 256).astype(np.uint8)).convert(mode)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt)
+    buf.seek(0)
+
+    small = decode_image(buf)
+    assert small.mode == "L"
+    assert 224 <= min(small.size) < 800
+    assert preprocess_image(small).shape == (1, 1, 224, 224)
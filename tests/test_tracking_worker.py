@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+from tracking_worker import (NO_HANDS, RESULT_SIZE, RemoteHandsPool, TrackingProcess, TrackingResults,
+                             encode_results)
+
+FAKE_HANDS = '''
+import time
+from types import SimpleNamespace as NS
+
+class FakeHands:
+    """One hand whose landmark x is the first pixel's red value / 255"""
+    def __init__(self, **config):
+        self.config = config
+
+    def process(self, rgb):
+        points = [NS(x=rgb[0, 0, 0] / 255, y=j / 21, z=0.0) for j in range(21)]
+        side = NS(classification=[NS(label="Right", score=0.9)])
+        return NS(multi_hand_landmarks=[NS(landmark=points)], multi_handedness=[side])
+
+    def close(self):
+        pass
+
+
+class SlowHands(FakeHands):
+    def process(self, rgb):
+        time.sleep(0.2)
+        return super().process(rgb)
+'''
+
+
+def test_results_round_trip_through_a_result_block():
+    fake = TrackingResults(np.full((2, 21, 3), 0.25), [(1, 0.8), (0, 0.6)])
+    block = np.zeros(RESULT_SIZE)
+    assert encode_results(fake, block) == 2
+    assert encode_results(NO_HANDS, np.zeros(RESULT_SIZE)) == 0
+    assert NO_HANDS.multi_hand_landmarks is None
+    assert fake.multi_hand_landmarks[1].landmark[20].x == 0.25
+    assert [h.classification[0].label for h in fake.multi_handedness] == ["Right", "Left"]
+
+
+def wait_for(hands, frame):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        hands.next_frame()
+        results = hands.process_bgr(frame)
+        if results.multi_hand_landmarks:
+            return results
+        time.sleep(0.01)
+    raise AssertionError("worker never published landmarks")
+
+
+def test_worker_tracks_frames_from_shared_memory(tmp_path):
+    (tmp_path / "fake_hands.py").write_text(FAKE_HANDS)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path)] + sys.path))
+    client = TrackingProcess(max_shape=(48, 64, 3), factory="fake_hands:FakeHands", env=env)
+    pool = RemoteHandsPool(client)
+    try:
+        hands = pool.acquire(max_num_hands=1)
+        assert client.wait_ready()
+        frame = np.zeros((96, 128, 3), dtype=np.uint8)  # larger than the ring, so it is scaled down
+        frame[..., 2] = 30  # red in BGR; the worker does the conversion
+        results = wait_for(hands, frame)
+        assert round(results.multi_hand_landmarks[0].landmark[0].x * 255) == 30
+        assert hands.process(frame) is results  # once per frame, like FrameHands
+
+        # a new level's handle never sees the previous level's landmarks
+        other = pool.acquire(max_num_hands=2)
+        fresh = other.process(frame)
+        assert fresh is NO_HANDS or fresh.frame_seq > results.frame_seq
+        stats = pool.stats()
+        assert stats["graphs"] == 2 and stats["resized"] >= 1 and stats["tracked"] >= 1
+    finally:
+        pool.close()
+    assert not client.alive()
+
+
+def test_submits_during_a_slow_inference_coalesce_into_one_wakeup(tmp_path):
+    (tmp_path / "fake_hands.py").write_text(FAKE_HANDS)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path)] + sys.path))
+    client = TrackingProcess(max_shape=(48, 64, 3), factory="fake_hands:SlowHands", env=env)
+    pool = RemoteHandsPool(client)
+    try:
+        hands = pool.acquire(max_num_hands=1)
+        assert client.wait_ready()
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        wait_for(hands, frame)
+        wakeups = client.wakeups
+
+        t0 = time.monotonic()
+        for i in range(500):  # far more frames than the worker can track meanwhile
+            frame[..., 2] = 50 if i < 499 else 200
+            hands.next_frame()
+            hands.process_bgr(frame)
+        assert time.monotonic() - t0 < 1.0  # never waited on the worker
+        assert client.wakeups - wakeups <= 2
+
+        # the newest frame is still tracked, without a wake-up per stale frame
+        deadline = time.monotonic() + 10
+        while client.results(hands.gen).frame_seq != client._seq:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert round(client.results(hands.gen).multi_hand_landmarks[0].landmark[0].x * 255) == 200
+        assert client.stats()["tracked"] <= 10
+    finally:
+        pool.close()
+
+
+class FakeClient:
+    def __init__(self):
+        self.running = False
+        self.configured, self.dropped = [], []
+
+    def alive(self):
+        return self.running
+
+    def start(self):
+        self.running = True
+
+    def configure(self, gen, config, stream=None):
+        self.configured.append(gen)
+
+    def drop(self, gen):
+        self.dropped.append(gen)
+
+    def stats(self):
+        return {}
+
+
+def test_pool_retires_generations_so_the_worker_table_stays_bounded():
+    client = FakeClient()
+    pool = RemoteHandsPool(client)
+    warm = pool.warm(max_num_hands=1)
+    assert pool.warm(max_num_hands=1).gen == warm.gen  # warming again reuses the generation
+    gens = [pool.acquire(max_num_hands=1).gen for _ in range(5)]
+    other = pool.acquire(max_num_hands=2)
+
+    assert len(set(gens + [warm.gen])) == 6  # each level still gets a fresh generation
+    assert client.dropped == gens[:-1]
+    assert sorted(pool._configs) == [warm.gen, gens[-1], other.gen]
+    # a restarted worker is only sent the live generations
+    client.running, client.configured = False, []
+    pool.acquire(max_num_hands=2)
+    assert client.configured[:3] == [warm.gen, gens[-1], other.gen]
+    assert pool.stats()["graphs"] == 2
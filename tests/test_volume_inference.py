@@ -0,0 +1,77 @@
+import io
+import numpy as np
+from PIL import Image
+
+from volume_inference import _npy_view, aggregate, iter_slices, predict_volume
+
+
+def _volume(n=5):
+    rng = np.random.default_rng(0)
+    return rng.integers(-1000, 2000, (n, 64, 48)).astype(np.int16)
+
+
+def test_npy_file_and_upload_buffer_give_the_same_slices(tmp_path):
+    vol = _volume()
+    np.save(tmp_path / "vol.npy", vol)
+    buf = io.BytesIO()
+    np.save(buf, vol)
+
+    from_file = [np.asarray(s) for s in iter_slices(str(tmp_path / "vol.npy"))]
+    from_buf = [np.asarray(s) for s in iter_slices(buf, kind="npy")]
+    with open(tmp_path / "vol.npy", "rb") as f:  # an upload spooled to disk
+        assert isinstance(_npy_view(f), np.memmap)
+        from_stream = [np.asarray(s) for s in iter_slices(f, kind="npy")]
+    assert len(from_file) == len(vol)
+    assert all(np.array_equal(a, b) for a, b in zip(from_file, from_buf))
+    assert all(np.array_equal(a, b) for a, b in zip(from_file, from_stream))
+    assert from_file[0].dtype == np.uint8
+    # the volume's min/max maps to the full 8-bit range
+    assert min(a.min() for a in from_file) == 0 and max(a.max() for a in from_file) == 255
+
+
+def test_tiff_pages_and_directory_slices_in_order(tmp_path):
+    pages = [Image.fromarray(np.full((40, 30), 10 * i, dtype=np.uint8)) for i in range(12)]
+    pages[0].save(tmp_path / "vol.tif", save_all=True, append_images=pages[1:])
+    (tmp_path / "series").mkdir()
+    for i, page in enumerate(pages):
+        page.save(tmp_path / "series" / f"slice{i}.png")
+
+    for src in (tmp_path / "vol.tif", tmp_path / "series"):
+        values = [int(np.asarray(s)[0, 0]) for s in iter_slices(str(src))]
+        assert values == [10 * i for i in range(12)]
+
+
+def test_predict_volume_streams_fixed_size_batches():
+    seen = []
+
+    def cascade(x):
+        seen.append(x.shape[0])
+        return [("Ischemic" if v > 0.5 else "Normal", 0.9) for v in x.mean(dim=(1, 2, 3)).tolist()]
+
+    slices = (Image.fromarray(np.full((50, 50), 255 if i < 3 else 0, dtype=np.uint8)) for i in range(10))
+    result = predict_volume(slices, cascade, batch_size=4)
+    assert seen == [4, 4, 2]
+    assert [r["index"] for r in result["slices"]] == list(range(10))
+    assert result["aggregate"]["counts"] == {"Ischemic": 3, "Normal": 7}
+    # a minority of confident stroke slices still makes the volume positive
+    assert result["aggregate"]["prediction"] == "Ischemic"
+    assert aggregate([])["prediction"] is None
+
+
+def test_aggregate_needs_several_confident_slices():
+    def slices(*groups):
+        return [{"prediction": label, "confidence": c} for label, c, n in groups for _ in range(n)]
+
+    # softmax confidences are always >= 0.5; one borderline slice must not flag a scan
+    assert aggregate(slices(("Normal", 0.97, 20), ("Hemorrhagic", 0.55, 1)))["prediction"] == "Normal"
+    assert aggregate(slices(("Normal", 0.97, 20), ("Hemorrhagic", 0.95, 1)))["prediction"] == "Normal"
+    assert aggregate(slices(("Normal", 0.97, 20), ("Ischemic", 0.6, 5)))["prediction"] == "Normal"
+
+    mixed = slices(("Normal", 0.97, 20), ("Ischemic", 0.9, 4), ("Hemorrhagic", 0.85, 2), ("Hemorrhagic", 0.6, 3))
+    result = aggregate(mixed)
+    assert result["prediction"] == "Hemorrhagic"  # most severe, though Ischemic has more slices
+    assert result["positive_slices"] == {"Normal": 20, "Ischemic": 4, "Hemorrhagic": 2}
+    assert result["max_confidence"]["Hemorrhagic"] == 0.85
+    assert aggregate(mixed, min_slices=3)["prediction"] == "Ischemic"
+    assert aggregate(mixed, threshold=0.95)["prediction"] == "Normal"
+    assert aggregate(slices(("Ischemic", 0.9, 1)), min_slices=1)["prediction"] == "Ischemic"
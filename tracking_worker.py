@@ -0,0 +1,497 @@
+"""
+Out-of-process hand tracking.
+
+MediaPipe runs in a worker process instead of on the Tk main thread. A level
+copies each frame into a shared-memory ring and immediately gets back the
+newest landmarks the worker has published in a second shared-memory block,
+so an inference spike delays the landmarks by a frame instead of stalling
+the UI. The worker always tracks the newest frame in the ring; frames it
+had no time for are skipped, not queued.
+
+RemoteHandsPool has the same acquire()/warm()/close()/stats() interface as
+hand_tracking.HandsPool and its handles behave like FrameHands, so levels
+don't change. hand_tracking.hands_pool() returns one when
+HAND_TRACKING_PROCESS=1.
+
+The worker is this file run as a script. Its stdin carries detector
+configurations (JSON lines) and one wake-up line per frame; it exits when
+stdin closes, so it cannot outlive the game.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from hand_tracking import HANDS_DEFAULTS, HandsPool
+
+MAX_HANDS = 4
+N_LANDMARKS = 21
+# per frame slot: seq_begin, seq_end, height, width, is_bgr, gen, submit time (time.monotonic)
+SLOT_HEADER = 8
+# result block: seq_begin, seq_end, frame seq, gen, hands, submit time, inference ms, worker ready,
+# seq of the frame the worker last took from the ring
+RESULT_HEADER = 9
+RESULT_SIZE = RESULT_HEADER + MAX_HANDS * (N_LANDMARKS * 3 + 2)
+LANDMARKS_END = RESULT_HEADER + MAX_HANDS * N_LANDMARKS * 3
+
+
+def _frame_views(buf, slots, shape):
+    headers = np.ndarray((slots, SLOT_HEADER), np.float64, buffer=buf)
+    pixels = np.ndarray((slots,) + tuple(shape), np.uint8, buffer=buf, offset=headers.nbytes)
+    return headers, pixels
+
+
+def _frame_bytes(slots, shape):
+    return slots * SLOT_HEADER * 8 + slots * int(np.prod(shape))
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # the game owns the segments; otherwise Python < 3.13 unlinks them when the worker exits
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+# ============ LANDMARK ENCODING ============
+
+def encode_results(results, block):
+    """Write MediaPipe results into the landmark part of a result block; returns the hand count"""
+    hands = getattr(results, "multi_hand_landmarks", None) or []
+    sides = getattr(results, "multi_handedness", None) or []
+    landmarks = block[RESULT_HEADER:LANDMARKS_END].reshape(MAX_HANDS, N_LANDMARKS, 3)
+    handedness = block[LANDMARKS_END:].reshape(MAX_HANDS, 2)
+    n = min(len(hands), MAX_HANDS)
+    for i in range(n):
+        landmarks[i] = [(p.x, p.y, p.z) for p in hands[i].landmark]
+        if i < len(sides):
+            c = sides[i].classification[0]
+            handedness[i] = (1.0 if c.label == "Right" else 0.0, c.score)
+        else:
+            handedness[i] = (-1.0, 0.0)
+    return n
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class HandLandmarks:
+    """Stands in for MediaPipe's NormalizedLandmarkList"""
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+class Classification:
+    __slots__ = ("index", "label", "score")
+
+    def __init__(self, index, score):
+        self.index = index
+        self.label = "Right" if index == 1 else "Left"
+        self.score = score
+
+
+class Handedness:
+    __slots__ = ("classification",)
+
+    def __init__(self, index, score):
+        self.classification = [Classification(index, score)]
+
+
+class TrackingResults:
+    """The attributes levels read from MediaPipe's results, rebuilt from landmark arrays.
+    Like MediaPipe, the lists are None when no hand was found."""
+    def __init__(self, landmarks=(), handedness=(), frame_seq=0):
+        self.frame_seq = frame_seq
+        self.multi_hand_landmarks = [HandLandmarks(points) for points in landmarks] or None
+        self.multi_handedness = [Handedness(int(index), float(score))
+                                 for index, score in handedness if index >= 0] or None
+
+
+NO_HANDS = TrackingResults()
+
+
+# ============ WORKER PROCESS ============
+
+def _newest_frame(headers, pixels, last_seq):
+    """(seq, gen, submit_t, rgb copy) for the newest complete frame after last_seq, else None"""
+    for slot in np.argsort(headers[:, 1])[::-1]:
+        seq = headers[slot, 1]
+        if seq <= last_seq:
+            return None
+        if headers[slot, 0] != seq:
+            continue  # being written
+        h, w, is_bgr, gen, submit_t = headers[slot, 2:7]
+        view = pixels[slot, :int(h), :int(w)]
+        frame = cv2.cvtColor(view, cv2.COLOR_BGR2RGB) if is_bgr else np.ascontiguousarray(view)
+        if headers[slot, 0] != seq:
+            continue  # overwritten while copying
+        return int(seq), int(gen), submit_t, frame
+    return None
+
+
+def worker_main(argv=None):
+    parser = argparse.ArgumentParser(description="Hand-tracking worker (started by RemoteHandsPool)")
+    parser.add_argument("--frames", required=True, help="shared-memory name of the frame ring")
+    parser.add_argument("--results", required=True, help="shared-memory name of the result block")
+    parser.add_argument("--slots", type=int, required=True)
+    parser.add_argument("--shape", type=int, nargs=3, required=True, metavar=("H", "W", "C"))
+    parser.add_argument("--factory", default="hand_tracking:_mediapipe_hands",
+                        help="module:callable building a detector from Hands keyword arguments")
+    args = parser.parse_args(argv)
+
+    frames_shm, results_shm = _attach(args.frames), _attach(args.results)
+    headers, pixels = _frame_views(frames_shm.buf, args.slots, args.shape)
+    block = np.ndarray((RESULT_SIZE,), np.float64, buffer=results_shm.buf)
+    module, attr = args.factory.split(":")
+    pool = HandsPool(factory=getattr(importlib.import_module(module), attr))
+    detectors = {}
+    last_seq, published = 0, 0
+    block[7] = 1
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if line.startswith("{"):
+                msg = json.loads(line)
+                if msg.get("drop"):
+                    detectors.pop(msg["gen"], None)
+                else:
+                    detectors[msg["gen"]] = pool.warm(stream=msg.get("stream"), **msg["config"])
+                continue
+            # one wake-up covers every frame submitted so far: keep taking the
+            # newest until the ring has nothing newer than the last one tracked
+            while True:
+                frame = _newest_frame(headers, pixels, last_seq)
+                if frame is None:
+                    break
+                seq, gen, submit_t, rgb = frame
+                last_seq = seq
+                block[8] = seq  # lets the game send the next wake-up
+                hands = detectors.get(gen)
+                if hands is None:
+                    continue
+                t0 = time.perf_counter()
+                hands.next_frame()
+                results = hands.process(rgb)
+                infer_ms = (time.perf_counter() - t0) * 1000
+                # seqlock: a reader that sees seq_begin != seq_end retries or keeps its last result
+                published += 1
+                block[0] = published
+                n = encode_results(results, block)
+                block[2:7] = (seq, gen, n, submit_t, infer_ms)
+                block[1] = published
+    except KeyboardInterrupt:
+        pass
+    finally:
+        block[7] = 0
+        pool.close()
+        del headers, pixels, block
+        frames_shm.close()
+        results_shm.close()
+    return 0
+
+
+# ============ GAME SIDE ============
+
+class TrackingProcess:
+    """Owns the worker process and both shared-memory blocks"""
+    def __init__(self, slots=3, max_shape=(720, 1280, 3), factory=None, python=None, env=None):
+        """
+        slots: frames in the ring; the worker reads the newest, so 3 means a
+            frame is never overwritten while it is being copied out.
+        max_shape: largest frame the ring holds; bigger frames are scaled down.
+        factory: "module:callable" the worker builds detectors with.
+        """
+        self.slots = slots
+        self.max_shape = tuple(max_shape)
+        self.factory = factory
+        self.python = python or sys.executable or "python"
+        self.env = env
+        self.proc = None
+        self._lock = threading.Lock()
+        self._frames_shm = self._results_shm = None
+        self._seq = 0
+        self._result_seq = 0
+        self._wake_seq = 0
+        self._results = {}
+        self.starts = 0
+        self.submitted = 0
+        self.wakeups = 0
+        self.resized = 0
+        self.latency_ms = None
+        self.max_latency_ms = 0.0
+        self.infer_ms = None
+
+    def start(self):
+        with self._lock:
+            if self.alive():
+                return self
+            self._close_shm()
+            self._frames_shm = shared_memory.SharedMemory(create=True, size=_frame_bytes(self.slots, self.max_shape))
+            self._results_shm = shared_memory.SharedMemory(create=True, size=RESULT_SIZE * 8)
+            self._headers, self._pixels = _frame_views(self._frames_shm.buf, self.slots, self.max_shape)
+            self._block = np.ndarray((RESULT_SIZE,), np.float64, buffer=self._results_shm.buf)
+            self._headers[:] = 0
+            self._block[:] = 0
+            self._seq = self._result_seq = self._wake_seq = 0
+            self._results = {}
+            cmd = [self.python, os.path.abspath(__file__), "--frames", self._frames_shm.name,
+                   "--results", self._results_shm.name, "--slots", str(self.slots),
+                   "--shape", *map(str, self.max_shape)]
+            if self.factory:
+                cmd += ["--factory", self.factory]
+            self.proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)), env=self.env,
+                                         stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+            self.starts += 1
+        return self
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def wait_ready(self, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.alive():
+            if self._block[7] == 1:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _send(self, line):
+        try:
+            self.proc.stdin.write(line.encode() + b"\n")
+            self.proc.stdin.flush()
+            return True
+        except (OSError, ValueError, AttributeError):
+            return False
+
+    def configure(self, gen, config, stream=None):
+        """Tell the worker which detector configuration frames tagged gen use"""
+        with self._lock:
+            return self._send(json.dumps({"gen": gen, "config": config, "stream": stream}))
+
+    def drop(self, gen):
+        """Tell the worker frames tagged gen won't come any more, and forget its results"""
+        with self._lock:
+            self._results.pop(gen, None)
+            return self._send(json.dumps({"gen": gen, "drop": True}))
+
+    def submit(self, frame, is_bgr, gen):
+        """Copy a 3-channel frame into the ring and wake the worker; returns the frame's seq, or None.
+        At most one wake-up is in the pipe at a time: while the worker hasn't taken
+        the frame the last one was sent for, it will find this newer frame anyway.
+        The pipe never fills, so a slow worker can't block the game on write()."""
+        h, w = frame.shape[:2]
+        max_h, max_w = self.max_shape[:2]
+        if h > max_h or w > max_w:
+            # landmarks are normalised, so a uniformly scaled frame gives the same coordinates
+            scale = min(max_h / h, max_w / w)
+            frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+            h, w = frame.shape[:2]
+            self.resized += 1
+        with self._lock:
+            if not self.alive():
+                return None
+            self._seq += 1
+            header = self._headers[self._seq % self.slots]
+            header[0] = self._seq
+            self._pixels[self._seq % self.slots, :h, :w] = frame
+            header[2:7] = (h, w, 1.0 if is_bgr else 0.0, gen, time.monotonic())
+            header[1] = self._seq
+            self.submitted += 1
+            if self._block[8] < self._wake_seq:
+                return self._seq
+            self._wake_seq = self._seq
+            self.wakeups += 1
+            return self._seq if self._send("f") else None
+
+    def results(self, gen):
+        """The newest published results for frames tagged gen (NO_HANDS if there are none yet)"""
+        with self._lock:
+            if self._block is None:
+                return NO_HANDS
+            seq = self._block[1]
+            if seq > self._result_seq:
+                snapshot = self._block.copy()
+                if snapshot[0] == seq == self._block[0]:
+                    self._publish(snapshot)
+            return self._results.get(gen, NO_HANDS)
+
+    def _publish(self, block):
+        self._result_seq = int(block[1])
+        frame_seq, gen, n, submit_t, infer_ms = block[2:7]
+        infer_ms = float(infer_ms)
+        latency = (time.monotonic() - submit_t) * 1000
+        self.latency_ms = latency if self.latency_ms is None else 0.9 * self.latency_ms + 0.1 * latency
+        self.max_latency_ms = max(self.max_latency_ms, latency)
+        self.infer_ms = infer_ms if self.infer_ms is None else 0.9 * self.infer_ms + 0.1 * infer_ms
+        n = int(n)
+        landmarks = block[RESULT_HEADER:LANDMARKS_END].reshape(MAX_HANDS, N_LANDMARKS, 3)[:n]
+        handedness = block[LANDMARKS_END:].reshape(MAX_HANDS, 2)[:n]
+        self._results[int(gen)] = TrackingResults(landmarks, handedness, int(frame_seq))
+
+    def stop(self, timeout=2.0):
+        with self._lock:
+            proc, self.proc = self.proc, None
+            if proc is not None:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+                try:
+                    proc.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+            self._close_shm()
+
+    def _close_shm(self):
+        self._headers = self._pixels = self._block = None
+        for shm in (self._frames_shm, self._results_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._frames_shm = self._results_shm = None
+
+    def stats(self):
+        def ms(v):
+            return None if v is None else round(v, 2)
+        return {"alive": self.alive(), "starts": self.starts, "submitted": self.submitted, "wakeups": self.wakeups,
+                "tracked": self._result_seq, "skipped": max(0, self._seq - self._result_seq),
+                "resized": self.resized, "latency_ms": ms(self.latency_ms),
+                "max_latency_ms": ms(self.max_latency_ms), "infer_ms": ms(self.infer_ms)}
+
+
+class RemoteHands:
+    """FrameHands-compatible handle whose landmarks come from the tracking worker.
+
+    The first process()/process_bgr() call for a frame hands the frame to the
+    worker and returns the newest landmarks it has published for this
+    handle, which usually belong to an earlier frame. process_bgr() leaves
+    the BGR->RGB conversion to the worker.
+    """
+    def __init__(self, client, gen, config):
+        self.client = client
+        self.gen = gen
+        self.config = config
+        self._results = None
+        self._last = None
+        self.frames = 0
+        self.inferences = 0
+        self.reused = 0
+        self.skipped = 0
+
+    def next_frame(self, reuse=False):
+        if reuse and self._last is not None:
+            self._results = self._last
+            self.skipped += 1
+        else:
+            self._results = None
+        self.frames += 1
+
+    def _track(self, frame, is_bgr):
+        if self._results is None:
+            self.client.submit(frame, is_bgr, self.gen)
+            self._results = self._last = self.client.results(self.gen)
+            self.inferences += 1
+        else:
+            self.reused += 1
+        return self._results
+
+    def process(self, rgb):
+        return self._track(rgb, False)
+
+    def process_bgr(self, img):
+        return self._track(img, True)
+
+    @property
+    def results(self):
+        return self._results
+
+    def close(self):
+        self.next_frame()
+
+
+class RemoteHandsPool:
+    """HandsPool interface backed by a TrackingProcess.
+
+    Handles are told apart in the worker by a generation number. warm() hands
+    out one generation per configuration. Each acquire() takes a new one, so a
+    new level never sees the previous level's landmarks, and retires the
+    generation the previous acquire() of that configuration handed out. The
+    worker's detector table stays bounded by the number of configurations.
+    """
+    def __init__(self, client=None):
+        self.client = client or TrackingProcess()
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._configs = {}
+        self._warm = {}
+        self._acquired = {}
+        self.created = 0
+        self.reuses = 0
+        self.resets = 0  # the worker never restarts graphs
+
+    def _handle(self, config, stream, acquire):
+        full = dict(HANDS_DEFAULTS, **config)
+        key = (stream, tuple(sorted(full.items())))
+        with self._lock:
+            if not self.client.alive():
+                self.client.start()
+                # a restarted worker needs every live configuration again
+                for gen, (known_stream, known) in self._configs.items():
+                    self.client.configure(gen, known, known_stream)
+            gen = None if acquire else self._warm.get(key)
+            if gen is None:
+                self._gen += 1
+                gen = self._gen
+                self._configs[gen] = (stream, full)
+                self.client.configure(gen, full, stream)
+                if not acquire:
+                    self._warm[key] = gen
+            if acquire:
+                retired = self._acquired.get(key)
+                self._acquired[key] = gen
+                if retired is not None:
+                    del self._configs[retired]
+                    self.client.drop(retired)
+            return RemoteHands(self.client, gen, full)
+
+    def warm(self, stream=None, **config):
+        hands = self._handle(config, stream, acquire=False)
+        self.created += 1
+        return hands
+
+    def acquire(self, stream=None, **config):
+        hands = self._handle(config, stream, acquire=True)
+        self.reuses += 1
+        hands.next_frame()
+        return hands
+
+    def close(self):
+        self.client.stop()
+
+    def stats(self):
+        with self._lock:
+            configs = len({(stream, tuple(sorted(c.items()))) for stream, c in self._configs.values()})
+        return dict({"graphs": configs, "created": self.created, "reuses": self.reuses, "resets": self.resets,
+                     "process": True}, **self.client.stats())
+
+
+if __name__ == "__main__":
+    sys.exit(worker_main())
@@ -0,0 +1,200 @@
+"""
+Slice-by-slice inference over volumetric CT series.
+
+A volume is a multi-page TIFF, a directory of slice images or a .npy array
+of shape (slices, H, W). Slices are read lazily (TIFF pages are decoded one
+at a time, .npy files are memory-mapped) and pushed through the stage1/stage2
+cascade in fixed-size batches that reuse one input tensor, so memory stays
+bounded by the batch size rather than the number of slices.
+
+    python volume_inference.py scan.npy --batch-size 16
+    python volume_inference.py series_dir/ --json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from functools import partial
+
+import numpy as np
+import torch
+from PIL import Image, ImageSequence
+
+from quantize_models import IMAGE_EXTS
+from stroke_models import INPUT_SIZE, decode_image, load_classifier, preprocess_image, run_cascade
+
+VOLUME_EXTS = (".npy", ".tif", ".tiff")
+# Labels from most to least severe. A volume is reported as the most severe
+# label found on at least VOLUME_MIN_POSITIVE_SLICES slices with confidence
+# >= VOLUME_POSITIVE_CONFIDENCE. Each cascade stage is a two-way softmax, so
+# every slice's confidence is already >= 0.5; the threshold has to sit well
+# above that to filter anything.
+SEVERITY = ("Hemorrhagic", "Ischemic", "Normal")
+VOLUME_POSITIVE_CONFIDENCE = float(os.environ.get("VOLUME_POSITIVE_CONFIDENCE", 0.8))
+VOLUME_MIN_POSITIVE_SLICES = int(os.environ.get("VOLUME_MIN_POSITIVE_SLICES", 2))
+
+
+def _natural_key(name):
+    # slice2.png sorts before slice10.png
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def _to_uint8(arr, lo, hi):
+    if arr.dtype == np.uint8:
+        return arr
+    scale = 255.0 / (hi - lo) if hi > lo else 0.0
+    return np.clip((arr.astype(np.float32) - lo) * scale, 0, 255).astype(np.uint8)
+
+
+def _intensity_range(volume, chunk=32):
+    """Min/max over the whole volume, read chunk slices at a time"""
+    if volume.dtype == np.uint8:
+        return 0, 255
+    lo, hi = np.inf, -np.inf
+    for i in range(0, len(volume), chunk):
+        part = volume[i:i + chunk]
+        lo, hi = min(lo, float(part.min())), max(hi, float(part.max()))
+    return lo, hi
+
+
+def _npy_view(fileobj):
+    """Zero-copy array over an open .npy file object: memory-mapped when it is a
+    real file (e.g. an upload spooled to disk), a view of the buffer for a BytesIO"""
+    fileobj.seek(0)
+    fmt = np.lib.format
+    read_header = fmt.read_array_header_1_0 if fmt.read_magic(fileobj) == (1, 0) else fmt.read_array_header_2_0
+    shape, fortran, dtype = read_header(fileobj)
+    if fortran or dtype.hasobject:
+        raise ValueError("Only C-ordered numeric .npy volumes are supported")
+    offset = fileobj.tell()
+    if hasattr(fileobj, "getbuffer"):
+        return np.frombuffer(fileobj.getbuffer(), dtype=dtype, count=int(np.prod(shape)),
+                             offset=offset).reshape(shape)
+    return np.memmap(fileobj, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def _array_slices(volume, window=None):
+    if volume.ndim == 2:
+        volume = volume[None]
+    if volume.ndim != 3:
+        raise ValueError(f"Expected a (slices, H, W) volume, got shape {volume.shape}")
+    lo, hi = window if window else _intensity_range(volume)
+    for s in volume:
+        yield Image.fromarray(_to_uint8(np.asarray(s), lo, hi))
+
+
+def _tiff_slices(src):
+    with Image.open(src) as img:
+        for page in ImageSequence.Iterator(img):
+            if page.mode not in ("L", "LA", "RGB", "RGBA"):
+                # 16-bit CT pages: scale each page's own range to 8 bits
+                arr = np.asarray(page)
+                yield Image.fromarray(_to_uint8(arr, float(arr.min()), float(arr.max())))
+            else:
+                yield page.convert("L")
+
+
+def iter_slices(src, window=None, kind=None):
+    """
+    Yield the slices of src as grayscale PIL images, in order.
+    src: a directory, a .npy/.tif/.tiff path, or a binary file object (pass
+        kind="npy" or "tiff"). window: (lo, hi) intensity range mapped to
+        0..255 for non-uint8 .npy volumes; defaults to the volume's min/max.
+    """
+    if isinstance(src, (str, os.PathLike)):
+        if os.path.isdir(src):
+            names = sorted((n for n in os.listdir(src) if n.lower().endswith(IMAGE_EXTS)), key=_natural_key)
+            for name in names:
+                yield decode_image(os.path.join(src, name))
+            return
+        kind = kind or os.path.splitext(str(src))[1].lower().lstrip(".")
+    if kind == "npy":
+        volume = np.load(src, mmap_mode="r") if isinstance(src, (str, os.PathLike)) else _npy_view(src)
+        yield from _array_slices(volume, window)
+    elif kind in ("tif", "tiff"):
+        yield from _tiff_slices(src)
+    else:
+        raise ValueError(f"Unsupported volume format: {kind!r}")
+
+
+def aggregate(slice_results, threshold=None, min_slices=None):
+    """
+    Per-volume summary: slice counts, mean and max confidence per class, the
+    number of slices per class with confidence >= threshold, and the most
+    severe label with at least min_slices such slices (defaults
+    VOLUME_POSITIVE_CONFIDENCE and VOLUME_MIN_POSITIVE_SLICES). Confident
+    stroke slices make the volume positive even when most slices are Normal;
+    a single stray or borderline slice does not.
+    """
+    threshold = VOLUME_POSITIVE_CONFIDENCE if threshold is None else threshold
+    min_slices = VOLUME_MIN_POSITIVE_SLICES if min_slices is None else max(1, int(min_slices))
+    counts, conf, max_conf, positive = {}, {}, {}, {}
+    for r in slice_results:
+        label = r["prediction"]
+        counts[label] = counts.get(label, 0) + 1
+        conf[label] = conf.get(label, 0.0) + r["confidence"]
+        max_conf[label] = max(max_conf.get(label, 0.0), r["confidence"])
+        positive[label] = positive.get(label, 0) + (r["confidence"] >= threshold)
+    mean_conf = {label: conf[label] / counts[label] for label in counts}
+    rank = {label: i for i, label in enumerate(SEVERITY)}
+    found = [label for label in SEVERITY[:-1] if positive.get(label, 0) >= min_slices]
+    if found:
+        prediction = min(found, key=rank.get)
+    else:
+        prediction = SEVERITY[-1] if counts else None
+    return {"slices": len(slice_results), "prediction": prediction, "counts": counts,
+            "mean_confidence": mean_conf, "max_confidence": max_conf, "positive_slices": positive,
+            "threshold": threshold, "min_slices": min_slices}
+
+
+def predict_volume(slices, cascade_fn, batch_size=16, device="cpu"):
+    """
+    Run cascade_fn over an iterable of slice images batch_size at a time.
+    Returns {"slices": [{"index", "prediction", "confidence"}, ...], "aggregate": {...}}.
+    """
+    batch_size = max(1, int(batch_size))
+    buf = torch.empty((batch_size, 1) + INPUT_SIZE[::-1], dtype=torch.float32)
+    results, n = [], 0
+
+    def flush(count):
+        for label, confidence in cascade_fn(buf[:count].to(device)):
+            results.append({"index": len(results), "prediction": label, "confidence": float(confidence)})
+
+    for img in slices:
+        preprocess_image(img, out=buf[n, 0])
+        n += 1
+        if n == batch_size:
+            flush(n)
+            n = 0
+    if n:
+        flush(n)
+    return {"slices": results, "aggregate": aggregate(results)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-slice stroke predictions for a CT volume")
+    parser.add_argument("volume", help="multi-page TIFF, directory of slices or .npy array")
+    parser.add_argument("--stage1", default="best_stage1_model.pth")
+    parser.add_argument("--stage2", default="best_stage2_model.pth")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--window", type=float, nargs=2, metavar=("LO", "HI"),
+                        help="intensity range mapped to 0..255 for non-uint8 .npy volumes")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args(argv)
+
+    stage1, stage2 = load_classifier(args.stage1), load_classifier(args.stage2)
+    result = predict_volume(iter_slices(args.volume, window=args.window),
+                            partial(run_cascade, stage1, stage2), batch_size=args.batch_size)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    for r in result["slices"]:
+        print(f"{r['index']:4d}  {r['prediction']:12} {r['confidence']:.3f}")
+    agg = result["aggregate"]
+    print(f"{agg['slices']} slices -> {agg['prediction']}  counts {agg['counts']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())